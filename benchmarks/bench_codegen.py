@@ -0,0 +1,73 @@
+# benchmarks/bench_codegen.py
+#
+# Compares the DFATable interpreter with the generated Python matcher,
+# and a cold compile_regex (full build) with a warm one (from cache_dir).
+# Run from the project root:  python -m benchmarks.bench_codegen
+
+import random
+import tempfile
+import time
+
+from src import codegen
+from src.codegen import compile_regex, compile_table
+from src.dfa_table import postfix_to_table, table_accepts
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+PATTERNS = [
+    "(a|b)*abb",
+    "(a|b|c)*(abc|cab)(a|b|c)*",
+    "((a|b)*a(a|b)(a|b)(a|b))",
+]
+INPUT_SIZE = 1_000_000
+REPEAT = 3
+
+
+def best_time(func, *args):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(0)
+    text = "".join(random.choice("ab") for _ in range(INPUT_SIZE))
+
+    print(f"{'pattern':<32} {'states':>6} {'interpreter':>12} {'generated':>12} {'speedup':>8}")
+    for regex in PATTERNS:
+        postfix = regex_shunting_yard(insert_concatenation_operator(regex))
+        table = postfix_to_table(postfix)
+        match = compile_table(table)
+
+        assert match(text) == table_accepts(table, text)
+
+        interpreted = best_time(table_accepts, table, text)
+        generated = best_time(match, text)
+        mb = INPUT_SIZE / 1e6
+        print(
+            f"{regex:<32} {len(table):>6} {mb / interpreted:>9.1f}MB/s "
+            f"{mb / generated:>9.1f}MB/s {interpreted / generated:>7.1f}x"
+        )
+
+    # A word list: the build dominates the cold compile
+    words = sorted({"".join(random.choice("abcdefgh") for _ in range(6)) for _ in range(500)})
+    postfix = regex_shunting_yard(insert_concatenation_operator("|".join(words)))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        codegen.clear_cache()
+        start = time.perf_counter()
+        compile_regex(postfix, cache_dir)
+        cold = time.perf_counter() - start
+
+        codegen.clear_cache()
+        start = time.perf_counter()
+        compile_regex(postfix, cache_dir)
+        warm = time.perf_counter() - start
+
+    print(f"\ncompile_regex, {len(words)}-word union: cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/bench_parallel_dfa.py
+#
+# Serial nfa_to_dfa against parallel_nfa_to_dfa with 1, 2, 4, ... workers
+# on NFAs whose DFA has many states ("the n-th symbol from the end is a").
+# Run from the project root:  python -m benchmarks.bench_parallel_dfa
+
+import os
+import time
+
+from src.converter import postfix_to_nfa
+from src.nfa_dfa import nfa_to_dfa
+from src.parallel_dfa import parallel_nfa_to_dfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def nth_from_end(n):
+    return "(a|b|c)*a" + "(a|b|c)" * (n - 1)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    workers = [w for w in (1, 2, 4, 8, 16) if w <= cpus]
+
+    for n in (10, 12, 13):
+        regex = nth_from_end(n)
+        postfix = regex_shunting_yard(insert_concatenation_operator(regex))
+        nfa = postfix_to_nfa(postfix)
+
+        serial_time, (_, serial) = timed(nfa_to_dfa, nfa)
+        print(f"{regex}: {len(serial)} DFA states")
+        print(f"  serial      {serial_time:8.2f} s")
+
+        # Integer tables alone, without any pool
+        t, _ = timed(parallel_nfa_to_dfa, nfa, min_parallel=len(serial) + 1)
+        print(f"  in-process  {t:8.2f} s  ({serial_time / t:.1f}x)")
+
+        for w in workers:
+            t, (_, parallel) = timed(parallel_nfa_to_dfa, nfa, processes=w)
+            assert len(parallel) == len(serial)
+            print(f"  {w:>2} workers  {t:8.2f} s  ({serial_time / t:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
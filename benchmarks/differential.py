@@ -0,0 +1,487 @@
+# benchmarks/differential.py
+#
+# Differential fuzzing and matching benchmark of every engine in the
+# project against Python's re module.
+#
+#   1. Correctness: random regexes from the supported grammar (symbols,
+#      concatenation, |, *, +, ?) are matched against random, sampled and
+#      adversarial inputs; every engine must agree with re.fullmatch.
+#      re backtracks, and some patterns (a loop over something that can
+#      match the empty string, like ((b)?)*) take exponential time in it.
+#      Those are not sent to re, and re runs in a worker process with a
+#      timeout; in both cases the derivative engine is the reference and
+#      the case is counted in the report.
+#   2. Performance: for a fixed suite of patterns, each engine's compile
+#      time, peak compile memory and matching throughput (MB/s) are
+#      measured next to re.
+#
+# The report is saved as JSON. Given a previous report as baseline, the run
+# fails (exit code 1) on any mismatch or on a regression beyond the
+# thresholds.
+#
+# Run from the project root:
+#   python -m benchmarks.differential --output report.json
+#   python -m benchmarks.differential --baseline report.json --output new.json
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+from src.converter import postfix_to_nfa
+from src.nfa_dfa import nfa_to_dfa, dfa_accepts
+from src.nfa_reduction import reduce_nfa
+from src.parallel_dfa import parallel_nfa_to_dfa
+from src.fragments import FragmentCache
+from src.factoring import factor_alternations
+from src.derivatives import regex_to_dfa
+from src import derivatives
+from src.dfa_table import postfix_to_table, table_accepts
+from src.codegen import compile_regex
+from src import codegen
+from src.byte_dfa import ByteDFA
+from src.shared_tables import SharedTable
+from src.captures import compile_captures
+
+ALPHABET = "abc"
+
+# Seconds re may spend on one fuzz case before it is given up
+RE_TIMEOUT = 0.5
+
+# Default regression thresholds (relative to the baseline report)
+THRESHOLDS = {
+    "max_throughput_drop": 0.25,     # fail if MB/s falls by more than 25%
+    "max_compile_increase": 0.50,    # fail if compile time grows by more than 50%
+    "min_compile_ms": 1.0,           # ... ignored below this (timer noise)
+}
+
+BENCH_PATTERNS = [
+    "(a|b)*abb",
+    "(a|b|c)*(abc|cab)(a|b|c)*",
+    "(a|b)*a(a|b)(a|b)(a|b)",
+    "(ab|ba|aa|bb)*",
+    "(alpha|beta|gamma|delta)*",
+]
+
+
+# ------------------------------------------------------------------
+# Engines: name -> build(regex, postfix, resources) -> match(prepared)
+# plus an optional input preparation step (done outside the timings)
+# ------------------------------------------------------------------
+
+def _build_subset(regex, postfix, resources):
+    start, _ = nfa_to_dfa(postfix_to_nfa(postfix))
+    return lambda text: dfa_accepts(start, text)
+
+
+def _build_reduced(regex, postfix, resources):
+    reduced, _ = reduce_nfa(postfix_to_nfa(postfix))
+    start, _ = nfa_to_dfa(reduced)
+    return lambda text: dfa_accepts(start, text)
+
+
+def _build_parallel(regex, postfix, resources):
+    start, _ = parallel_nfa_to_dfa(postfix_to_nfa(postfix))
+    return lambda text: dfa_accepts(start, text)
+
+
+def _build_fragments(regex, postfix, resources):
+    start, _ = nfa_to_dfa(FragmentCache().compile(factor_alternations(postfix)))
+    return lambda text: dfa_accepts(start, text)
+
+
+def _build_derivatives(regex, postfix, resources):
+    start, _ = regex_to_dfa(postfix)
+    return lambda text: dfa_accepts(start, text)
+
+
+def _build_table(regex, postfix, resources):
+    table = postfix_to_table(postfix)
+    return lambda text: table_accepts(table, text)
+
+
+def _build_codegen(regex, postfix, resources):
+    return compile_regex(postfix)
+
+
+def _build_bytes(regex, postfix, resources):
+    return ByteDFA.from_postfix(postfix).matches
+
+
+def _build_shared(regex, postfix, resources):
+    shared = SharedTable.publish(postfix_to_table(postfix))
+    resources.append(shared)
+    return shared.matches
+
+
+def _build_pike(regex, postfix, resources):
+    matcher = compile_captures(regex)
+    return lambda text: matcher.fullmatch(text) is not None
+
+
+def _build_re(regex, postfix, resources):
+    return re.compile(regex).fullmatch
+
+
+ENGINES = {
+    "subset": (_build_subset, None),
+    "reduced": (_build_reduced, None),
+    "parallel": (_build_parallel, None),
+    "fragments": (_build_fragments, None),
+    "derivatives": (_build_derivatives, None),
+    "table": (_build_table, None),
+    "codegen": (_build_codegen, None),
+    "bytes": (_build_bytes, lambda text: text.encode("utf-8")),
+    "shared": (_build_shared, None),
+    "pike": (_build_pike, None),
+    "re": (_build_re, None),
+}
+
+
+def _release(resources):
+    for shared in resources:
+        shared.unlink()
+        shared.close()
+    resources.clear()
+
+
+def _reset_caches():
+    """Drop process-wide caches, so every build is measured from scratch."""
+    re.purge()
+    derivatives.clear_cache()
+    codegen.clear_cache()
+
+
+def _to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+# ------------------------------------------------------------------
+# Random regexes and inputs
+#   ("sym", c) ("cat", a, b) ("alt", a, b) ("*" | "+" | "?", a)
+# ------------------------------------------------------------------
+
+def random_tree(rng, depth):
+    if depth == 0 or rng.random() < 0.25:
+        return ("sym", rng.choice(ALPHABET))
+    op = rng.choice(["cat", "cat", "alt", "*", "+", "?"])
+    if op in ("cat", "alt"):
+        return (op, random_tree(rng, depth - 1), random_tree(rng, depth - 1))
+    return (op, random_tree(rng, depth - 1))
+
+
+def tree_to_regex(node):
+    op = node[0]
+    if op == "sym":
+        return node[1]
+    if op == "cat":
+        return tree_to_regex(node[1]) + tree_to_regex(node[2])
+    if op == "alt":
+        return f"({tree_to_regex(node[1])}|{tree_to_regex(node[2])})"
+    # Parenthesized so quantifiers never stack (re rejects "a**")
+    return f"({tree_to_regex(node[1])}){op}"
+
+
+def sample_match(node, rng, max_repeat=3):
+    """Return a random string matched by the tree."""
+    op = node[0]
+    if op == "sym":
+        return node[1]
+    if op == "cat":
+        return sample_match(node[1], rng) + sample_match(node[2], rng)
+    if op == "alt":
+        return sample_match(node[rng.randint(1, 2)], rng)
+    low = 1 if op == "+" else 0
+    high = 1 if op == "?" else max_repeat
+    return "".join(sample_match(node[1], rng) for _ in range(rng.randint(low, high)))
+
+
+def make_inputs(node, rng, count):
+    """Random strings, strings from the language, near misses and long runs."""
+    inputs = {""}
+    for _ in range(count):
+        inputs.add("".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 8))))
+
+        sample = sample_match(node, rng)
+        inputs.add(sample)
+        if sample:
+            # Near miss: one symbol replaced, dropped or appended
+            i = rng.randrange(len(sample))
+            inputs.add(sample[:i] + rng.choice(ALPHABET + "x") + sample[i + 1:])
+            inputs.add(sample[:i] + sample[i + 1:])
+            inputs.add(sample + rng.choice(ALPHABET))
+
+    # Adversarial: long runs that make backtracking engines work hard
+    for symbol in ALPHABET:
+        inputs.add(symbol * 64)
+        inputs.add(symbol * 64 + "x")
+    return sorted(inputs)
+
+
+def nullable(node):
+    op = node[0]
+    if op == "sym":
+        return False
+    if op == "cat":
+        return nullable(node[1]) and nullable(node[2])
+    if op == "alt":
+        return nullable(node[1]) or nullable(node[2])
+    if op == "+":
+        return nullable(node[1])
+    return True
+
+
+def re_may_explode(node):
+    """True if the tree loops ('*' or '+') over a sub-tree that matches ''."""
+    op = node[0]
+    if op == "sym":
+        return False
+    if op in ("*", "+") and nullable(node[1]):
+        return True
+    return any(re_may_explode(child) for child in node[1:])
+
+
+def _re_answers(regex, inputs):
+    match = re.compile(regex).fullmatch
+    return [match(text) is not None for text in inputs]
+
+
+def fuzz(seed=0, count=200, depth=4, inputs_per_case=10, engines=None):
+    """
+    Compare every engine with re.fullmatch on `count` random regexes.
+    Returns the correctness section of the report.
+    """
+    rng = random.Random(seed)
+    if engines is None:
+        engines = [name for name in ENGINES if name != "re"]
+    mismatches = []
+    by_engine = {name: 0 for name in engines}
+    total_inputs = 0
+    re_skipped = 0
+    re_timeouts = 0
+    pool = multiprocessing.Pool(1)
+
+    try:
+        for _ in range(count):
+            node = random_tree(rng, depth)
+            regex = tree_to_regex(node)
+            postfix = _to_postfix(regex)
+            inputs = make_inputs(node, rng, inputs_per_case)
+            total_inputs += len(inputs)
+
+            answers = None
+            if re_may_explode(node):
+                re_skipped += 1
+            else:
+                try:
+                    answers = pool.apply_async(_re_answers, (regex, inputs)).get(RE_TIMEOUT)
+                except multiprocessing.TimeoutError:
+                    re_timeouts += 1
+                    pool.terminate()
+                    pool = multiprocessing.Pool(1)
+            if answers is None:
+                start, _ = regex_to_dfa(postfix)
+                answers = [dfa_accepts(start, text) for text in inputs]
+
+            for name in engines:
+                build, prepare = ENGINES[name]
+                resources = []
+                try:
+                    match = build(regex, postfix, resources)
+                    for text, expected in zip(inputs, answers):
+                        got = bool(match(prepare(text) if prepare else text))
+                        if got != expected:
+                            by_engine[name] += 1
+                            if len(mismatches) < 50:
+                                mismatches.append(
+                                    {"engine": name, "regex": regex, "text": text,
+                                     "expected": expected, "got": got}
+                                )
+                finally:
+                    _release(resources)
+    finally:
+        pool.terminate()
+
+    return {
+        "seed": seed,
+        "cases": count,
+        "inputs": total_inputs,
+        "re_skipped": re_skipped,
+        "re_timeouts": re_timeouts,
+        "mismatches": mismatches,
+        "mismatches_by_engine": by_engine,
+    }
+
+
+# ------------------------------------------------------------------
+# Performance
+# ------------------------------------------------------------------
+
+def bench_input(regex, rng, size):
+    """A long input that the engine has to read to the end."""
+    words = re.findall(r"[a-z]{2,}", regex)
+    if words:
+        text = []
+        while sum(map(len, text)) < size:
+            text.append(rng.choice(words))
+        return "".join(text)
+    symbols = sorted(set(re.findall(r"[a-z]", regex)))
+    return "".join(rng.choice(symbols) for _ in range(size))
+
+
+def measure(name, regex, text, repeat=3):
+    build, prepare = ENGINES[name]
+    postfix = _to_postfix(regex)
+    resources = []
+
+    try:
+        # Compile time (best of `repeat`), then peak memory in a separate build
+        compile_times = []
+        for _ in range(repeat):
+            _release(resources)
+            _reset_caches()
+            start = time.perf_counter()
+            match = build(regex, postfix, resources)
+            compile_times.append(time.perf_counter() - start)
+
+        _release(resources)
+        _reset_caches()
+        tracemalloc.start()
+        match = build(regex, postfix, resources)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        data = prepare(text) if prepare else text
+        match_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            match(data)
+            match_times.append(time.perf_counter() - start)
+    finally:
+        _release(resources)
+
+    return {
+        "compile_ms": round(min(compile_times) * 1000, 3),
+        "memory_kb": round(peak / 1024, 1),
+        "throughput_mb_s": round(len(text) / 1e6 / min(match_times), 3),
+    }
+
+
+def benchmark(size=100_000, seed=0, engines=None, patterns=BENCH_PATTERNS):
+    rng = random.Random(seed)
+    if engines is None:
+        engines = list(ENGINES)
+    results = {}
+    for regex in patterns:
+        text = bench_input(regex, rng, size)
+        results[regex] = {name: measure(name, regex, text) for name in engines}
+    return results
+
+
+# ------------------------------------------------------------------
+# Report and regression check
+# ------------------------------------------------------------------
+
+def check_regressions(report, baseline, thresholds=THRESHOLDS):
+    """Return a list of human-readable failures (empty when all is well)."""
+    failures = []
+    for mismatch in report["correctness"]["mismatches"]:
+        failures.append(
+            f"{mismatch['engine']}: {mismatch['regex']!r} on {mismatch['text']!r} "
+            f"gave {mismatch['got']}, expected {mismatch['expected']}"
+        )
+
+    if baseline is None:
+        return failures
+
+    for regex, engines in report["performance"].items():
+        for name, now in engines.items():
+            before = baseline.get("performance", {}).get(regex, {}).get(name)
+            if before is None:
+                continue
+
+            floor = before["throughput_mb_s"] * (1 - thresholds["max_throughput_drop"])
+            if now["throughput_mb_s"] < floor:
+                failures.append(
+                    f"{name} on {regex!r}: throughput {now['throughput_mb_s']} MB/s "
+                    f"< {floor:.3f} (baseline {before['throughput_mb_s']})"
+                )
+
+            ceiling = before["compile_ms"] * (1 + thresholds["max_compile_increase"])
+            if now["compile_ms"] > max(ceiling, thresholds["min_compile_ms"]):
+                failures.append(
+                    f"{name} on {regex!r}: compile {now['compile_ms']} ms "
+                    f"> {ceiling:.3f} (baseline {before['compile_ms']})"
+                )
+    return failures
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Differential fuzzing and benchmark against re.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=200, help="Number of random regexes.")
+    parser.add_argument("--size", type=int, default=100_000, help="Benchmark input size (characters).")
+    parser.add_argument("--engines", type=str, default=None, help="Comma separated engine names.")
+    parser.add_argument("--output", type=str, default="differential_report.json")
+    parser.add_argument("--baseline", type=str, default=None, help="Previous report to compare with.")
+    parser.add_argument("--max-throughput-drop", type=float, default=THRESHOLDS["max_throughput_drop"])
+    parser.add_argument("--max-compile-increase", type=float, default=THRESHOLDS["max_compile_increase"])
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    engines = args.engines.split(",") if args.engines else None
+    thresholds = dict(
+        THRESHOLDS,
+        max_throughput_drop=args.max_throughput_drop,
+        max_compile_increase=args.max_compile_increase,
+    )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "size": args.size,
+        },
+        "thresholds": thresholds,
+        "correctness": fuzz(args.seed, args.count, engines=[e for e in engines or ENGINES if e != "re"]),
+        "performance": benchmark(args.size, args.seed, engines),
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = check_regressions(report, baseline, thresholds)
+    report["failures"] = failures
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for regex, engines_result in report["performance"].items():
+        print(regex)
+        for name, r in engines_result.items():
+            print(
+                f"  {name:<12} {r['throughput_mb_s']:>9.2f} MB/s "
+                f"{r['compile_ms']:>10.2f} ms {r['memory_kb']:>10.1f} KB"
+            )
+    print(f"[ok] Report saved as '{args.output}'")
+
+    if failures:
+        for failure in failures:
+            print(f"[error] {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,34 +2,22 @@ from typing import Optional
 import argparse
 import sys
 
-# Import project modules (original)
-try:
-    from src.prepocessor import insert_concatenation_operator
-    from src.parser import regex_shunting_yard
-    from src.converter import postfix_to_nfa
-    from src.display import display_nfa
-    from src.nfa_dfa import nfa_to_dfa 
-except Exception as e:
-    msg = (
-        "Failed to import project modules from src/. Make sure your project has:\n"
-        "  src/preprocessor.py (insert_concatenation_operator)\n"
-        "  src/parser.py (shunting_yard)\n"
-        "  src/converter.py (postfix_to_nfa)\n"
-        "  src/display.py (display_nfa)\n\n"
-        f"Original error: {e}"
-    )
-    raise ImportError(msg)
-
-# NEW IMPORT for NFA → DFA
-try:
-    from src.nfa_to_dfa import nfa_to_dfa
-except Exception:
-    print("[warning] nfa_to_dfa not found. DFA conversion will be unavailable.")
+# Project modules. display.py only imports graphviz when a graph is drawn.
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+from src.fragments import FragmentCache
+from src.factoring import factor_alternations
+from src.nfa_reduction import reduce_nfa, format_report
+from src.display import display_nfa
+from src.nfa_dfa import nfa_to_dfa
 
 
 # GLOBAL: stores last built NFA
 LAST_NFA = None
 
+# GLOBAL: sub-expression fragments shared between regexes of one session
+FRAGMENT_CACHE = FragmentCache()
+
 
 def process_regex(regex: str, output_filename: str = "nfa_graph", show_steps: bool = False):
     """
@@ -46,15 +34,22 @@ def process_regex(regex: str, output_filename: str = "nfa_graph", show_steps: bo
     # 2. Convert to postfix
     postfix = regex_shunting_yard(preprocessed)
 
+    # 2b. Share common prefixes/tails between the branches of unions
+    factored = factor_alternations(postfix)
+
     if show_steps:
         print(f"Raw regex      : {regex}")
         print(f"Preprocessed   : {preprocessed}")
         print(f"Postfix        : {postfix}")
+        print(f"Factored       : {factored}")
 
-    # 3. Build NFA
-    nfa = postfix_to_nfa(postfix)
+    # 3. Build NFA (unchanged sub-expressions come from the fragment cache)
+    nfa = FRAGMENT_CACHE.compile(factored)
 
-    # Save globally for DFA conversion
+    if show_steps:
+        print(f"Fragment cache : {FRAGMENT_CACHE.stats()}")
+
+    # Save the NFA for DFA conversion (it is reduced there, only if asked for)
     LAST_NFA = nfa
 
     # 4. Display NFA
@@ -76,7 +71,10 @@ def convert_last_nfa_to_dfa():
     print("[info] Converting NFA to DFA...")
 
     try:
-        start_dfa, all_dfa_states = nfa_to_dfa(LAST_NFA)
+        # Drop epsilon moves and merge equivalent states before determinizing
+        reduced, report = reduce_nfa(LAST_NFA)
+        print(f"[info] Reduced NFA: {format_report(report)}")
+        start_dfa, all_dfa_states = nfa_to_dfa(reduced)
     except Exception as e:
         print(f"[error] DFA conversion failed: {e}")
         return
@@ -158,6 +156,19 @@ def build_arg_parser():
         action="store_true",
         help="Print preprocessing and postfix.",
     )
+    parser.add_argument(
+        "--serve",
+        type=str,
+        metavar="SOCKET",
+        default=None,
+        help="Run as a compile/match service on a Unix socket ('-' for stdin/stdout JSON lines).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=".",
+        help="Directory the service writes rendered graphs to (requests may only name files in it).",
+    )
     return parser
 
 
@@ -165,7 +176,14 @@ def main(argv: Optional[list] = None):
     parser = build_arg_parser()
     args = parser.parse_args(argv)
 
-    if args.regex is None:
+    if args.serve is not None:
+        from src.service import serve
+        try:
+            serve(args.serve, output_dir=args.output_dir)
+        except OSError as e:
+            print(f"[error] {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args.regex is None:
         interactive_prompt()
     else:
         try:
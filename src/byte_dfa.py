@@ -0,0 +1,108 @@
+# src/byte_dfa.py
+
+"""
+UTF-8 byte-level automata.
+
+The other engines label transitions with `str` characters, so a byte
+buffer has to be decoded (and copied) before it can be matched. This
+file turns a character DFA into an equivalent DFA over bytes: every
+character transition becomes the chain of its UTF-8 bytes, and the
+result is minimized, which merges the intermediate states of sequences
+that share a prefix (same source) or a suffix (same target).
+
+The byte DFA then runs directly over bytes, bytearray, memoryview or
+mmap objects, using one 256-entry row per state.
+"""
+
+from src.dfa_table import DFATable, dfa_to_table, minimize_table, postfix_to_table
+
+# Bytes checked between two tests for the dead state
+CHUNK_SIZE = 1 << 16
+
+
+def utf8_table(table: DFATable) -> DFATable:
+    """
+    Expand a character DFATable into a minimized DFATable whose symbols
+    are byte values (0-255). Invalid UTF-8 is rejected, because only the
+    encodings of the table's own symbols have transitions.
+    """
+    n = len(table)
+    transitions = [{} for _ in range(n)]
+    accepting = list(table.accepting)
+    intermediate = {}     # (state, byte prefix) -> intermediate state
+
+    for state, row in enumerate(table.transitions):
+        for char, target in row.items():
+            encoded = char.encode("utf-8")
+            current = state
+            # Every byte but the last leads to an intermediate state,
+            # shared by all characters with the same lead bytes
+            for i in range(len(encoded) - 1):
+                key = (state, encoded[: i + 1])
+                if key not in intermediate:
+                    intermediate[key] = len(transitions)
+                    transitions.append({})
+                    accepting.append(False)
+                nxt = intermediate[key]
+                transitions[current][encoded[i]] = nxt
+                current = nxt
+            transitions[current][encoded[-1]] = target
+
+    symbols = sorted({byte for row in transitions for byte in row})
+    return minimize_table(DFATable(symbols, transitions, accepting))
+
+
+class ByteDFA:
+    """
+    A byte-level DFA ready for matching.
+
+    Each state is a list of 256 entries, and each entry is directly the
+    list of the next state, so the inner loop is only `row = row[byte]`.
+    Missing transitions point to a dead row that loops on itself.
+    """
+
+    def __init__(self, table: DFATable):
+        self.table = table
+        rows = [[None] * 256 for _ in range(len(table))]
+        self.dead = [None] * 256
+        self.dead[:] = [self.dead] * 256
+
+        for state, row in enumerate(table.transitions):
+            for byte in range(256):
+                target = row.get(byte)
+                rows[state][byte] = rows[target] if target is not None else self.dead
+
+        self.start = rows[0]
+        # Identity of the accepting rows (lists are not hashable)
+        self.accepting = {id(rows[s]) for s in range(len(table)) if table.accepting[s]}
+        self._rows = rows
+
+    @classmethod
+    def from_dfa(cls, start_dfa) -> "ByteDFA":
+        """Build from a character DFA (nfa_to_dfa or regex_to_dfa)."""
+        return cls(utf8_table(minimize_table(dfa_to_table(start_dfa))))
+
+    @classmethod
+    def from_postfix(cls, postfix_regex: str) -> "ByteDFA":
+        return cls(utf8_table(postfix_to_table(postfix_regex)))
+
+    def matches(self, data) -> bool:
+        """
+        Return True if the whole buffer is accepted. `data` may be bytes,
+        bytearray, memoryview or mmap; it is read through a memoryview,
+        so nothing is decoded or copied.
+        """
+        dead = self.dead
+        row = self.start
+        with memoryview(data) as view:
+            if view.format != "B":
+                view = view.cast("B")
+            for offset in range(0, len(view), CHUNK_SIZE):
+                for byte in view[offset: offset + CHUNK_SIZE]:
+                    row = row[byte]
+                if row is dead:
+                    return False
+        return id(row) in self.accepting
+
+    def __len__(self):
+        return len(self.table)
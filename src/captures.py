@@ -0,0 +1,129 @@
+# src/captures.py
+
+"""
+Capture-group extraction with a Pike VM.
+
+Capturing groups are built by postfix_to_nfa as two tagged states around
+the group (slot 2k at the start of group k, slot 2k+1 at its end). The
+Pike VM below runs all NFA threads in lock-step over the input, each
+thread carrying its own slot tuple, so extraction takes
+O(len(text) * number of states) time whatever the pattern: no
+backtracking, no exponential blow-up.
+
+Threads are kept in priority order (leftmost-greedy, as in RE2): the
+first alternative of a '|' wins, and '*', '+' and '?' are greedy.
+Postfix_to_nfa creates the preferred branch first, so the preference is
+simply "lower state id first". For most patterns this gives the same
+groups as Python's re.fullmatch. It differs when a loop body can match
+the empty string: a thread never re-enters a state without consuming
+input, so an extra empty iteration is not taken. ((a)*)+ on "a" gives
+[(0, 1), (0, 1)] here, while re runs one more, empty, iteration of the
+'+' and reports [(1, 1), (0, 1)].
+"""
+
+from src.nfa_structure import NFA, EPSILON
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+from src.converter import postfix_to_nfa
+
+
+class CaptureMatcher:
+    """
+    An NFA flattened into integer-indexed arrays for the Pike VM:
+
+    eps       -> per state, epsilon targets in priority order
+    moves     -> per state, symbol -> list of targets
+    tags      -> per state, capture slot or None
+    accepting -> per state, bool
+    """
+
+    def __init__(self, nfa: NFA):
+        states = []
+        index = {}
+        stack = [nfa.start_state]
+        while stack:
+            state = stack.pop()
+            if state in index:
+                continue
+            index[state] = len(states)
+            states.append(state)
+            for targets in state.transitions.values():
+                stack.extend(targets)
+
+        def ordered(targets):
+            return [index[t] for t in sorted(targets, key=lambda s: s.id)]
+
+        self.eps = [ordered(s.transitions.get(EPSILON, ())) for s in states]
+        self.moves = [
+            {sym: ordered(targets) for sym, targets in s.transitions.items() if sym != EPSILON}
+            for s in states
+        ]
+        self.tags = [s.tag for s in states]
+        self.accepting = [s.is_accepting for s in states]
+        self.start = index[nfa.start_state]
+
+        tagged = [t for t in self.tags if t is not None]
+        self.group_count = (max(tagged) // 2 + 1) if tagged else 0
+
+    def _add_thread(self, threads, seen, state, slots, position):
+        """
+        Follow epsilon edges from `state` depth-first in priority order,
+        recording tags on the way, and append every thread that can read
+        a symbol or accept. A state already reached in this step belongs
+        to a higher-priority thread and is skipped.
+        """
+        eps = self.eps
+        tags = self.tags
+        stack = [(state, slots)]
+
+        while stack:
+            state, slots = stack.pop()
+            if state in seen:
+                continue
+            seen.add(state)
+
+            tag = tags[state]
+            if tag is not None:
+                slots = slots[:tag] + (position,) + slots[tag + 1:]
+
+            targets = eps[state]
+            if targets:
+                # Reversed, so the first target is popped (explored) first
+                for target in reversed(targets):
+                    stack.append((target, slots))
+            if self.moves[state] or self.accepting[state]:
+                threads.append((state, slots))
+
+    def fullmatch(self, text):
+        """
+        Match the whole of `text`. Returns None if it does not match,
+        otherwise a list with one (start, end) span per group, or None
+        for groups that did not take part in the match.
+        """
+        moves = self.moves
+        current = []
+        self._add_thread(current, set(), self.start, (None,) * (2 * self.group_count), 0)
+
+        for position, symbol in enumerate(text):
+            following = []
+            seen = set()
+            for state, slots in current:
+                for target in moves[state].get(symbol, ()):
+                    self._add_thread(following, seen, target, slots, position + 1)
+            current = following
+            if not current:
+                return None
+
+        for state, slots in current:
+            if self.accepting[state]:
+                return [
+                    (slots[2 * k], slots[2 * k + 1]) if slots[2 * k + 1] is not None else None
+                    for k in range(self.group_count)
+                ]
+        return None
+
+
+def compile_captures(regex: str) -> CaptureMatcher:
+    """Raw regex -> CaptureMatcher, with every '(...)' as a capturing group."""
+    postfix = regex_shunting_yard(insert_concatenation_operator(regex), capture=True)
+    return CaptureMatcher(postfix_to_nfa(postfix))
@@ -0,0 +1,64 @@
+# src/client.py
+
+"""
+Thin client for src/service.py. Only imports json and socket, so a
+client process starts in a few milliseconds and leaves all compiling
+to the warm service.
+"""
+
+import json
+import socket
+
+
+class ServiceClient:
+    """One connection to a running service; requests are sent one at a time."""
+
+    def __init__(self, socket_path: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.file = self.sock.makefile("rwb")
+        self.next_id = 0
+
+    def request(self, op: str, **fields) -> dict:
+        self.next_id += 1
+        payload = dict(fields, id=self.next_id, op=op)
+        self.file.write((json.dumps(payload) + "\n").encode())
+        self.file.flush()
+
+        response = json.loads(self.file.readline())
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "request failed"))
+        return response
+
+    def compile(self, regex: str) -> dict:
+        return self.request("compile", regex=regex)
+
+    def match(self, regex: str, text: str) -> bool:
+        return self.request("match", regex=regex, text=text)["match"]
+
+    def stats(self) -> dict:
+        return self.request("stats")
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    # python -m src.client SOCKET REGEX [TEXT]
+    import sys
+
+    if len(sys.argv) not in (3, 4):
+        sys.exit("usage: python -m src.client SOCKET REGEX [TEXT]")
+
+    with ServiceClient(sys.argv[1]) as client:
+        if len(sys.argv) == 4:
+            print("match" if client.match(sys.argv[2], sys.argv[3]) else "no match")
+        else:
+            print(client.compile(sys.argv[2]))
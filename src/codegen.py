@@ -0,0 +1,176 @@
+# src/codegen.py
+
+"""
+Python code generation for DFAs.
+
+Instead of interpreting a DFATable (one list index, one dict.get call and
+one None check per input symbol), the DFA is written out as Python source
+in which every state is a dict whose values are the next state dicts
+themselves. The generated matcher then only does `state = state[symbol]`
+per symbol, with the start state bound as a default argument (a fast
+local) and rejection handled by a single KeyError at the end.
+
+The source is compiled once with compile() and cached on disk as
+<key>.py, so another process asking for the same DFA only has to read
+and compile the file. The key is the table hash for compile_table and
+the pattern hash for compile_regex, which therefore skips the whole
+build on a warm start. The key is also written in the file's header and
+checked before the file is executed; a file whose header does not match
+is regenerated.
+"""
+
+import hashlib
+import marshal
+import os
+from collections import OrderedDict
+
+from src.dfa_table import DFATable, dfa_to_table, minimize_table, postfix_to_table, table_key
+
+# Key stored in accepting state dicts. Input symbols are one character
+# long, so the empty string can never collide with one.
+ACCEPT_KEY = ""
+
+# In-process cache: key -> compiled match function, least
+# recently used first. Bounded, so a long-running process (the service)
+# does not keep every matcher it ever compiled.
+MAX_COMPILED = 256
+_compiled = OrderedDict()
+
+
+def generate_source(table: DFATable, key: str = "") -> str:
+    """Return the Python source of a `match(text) -> bool` function for the table."""
+    lines = [
+        "# Generated by src/codegen.py -- do not edit.",
+        f"# key: {key}",
+        "",
+    ]
+
+    # 1. One dict per state (accepting states carry ACCEPT_KEY)
+    for state, accepting in enumerate(table.accepting):
+        lines.append(f"_s{state} = {{{ACCEPT_KEY!r}: True}}" if accepting else f"_s{state} = {{}}")
+
+    # 2. Link the states together
+    for state, row in enumerate(table.transitions):
+        if row:
+            items = ", ".join(f"{symbol!r}: _s{target}" for symbol, target in row.items())
+            lines.append(f"_s{state}.update({{{items}}})")
+
+    lines += [
+        "",
+        "",
+        "def match(text, _start=_s0):",
+        "    state = _start",
+        "    try:",
+        "        for symbol in text:",
+        "            state = state[symbol]",
+        "    except KeyError:",
+        "        return False",
+        f"    return {ACCEPT_KEY!r} in state",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _header_key(source: str) -> str:
+    """Return the cache key recorded in a generated file's header, or ''."""
+    lines = source.split("\n", 2)
+    if len(lines) < 2 or not lines[1].startswith("# key: "):
+        return ""
+    return lines[1][len("# key: "):]
+
+
+def _load(source: str, filename: str):
+    namespace = {}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["match"]
+
+
+def _compile(key: str, make_table, cache_dir: str = None):
+    """
+    Return the matcher cached under `key` in this process or in
+    `cache_dir` (as <key>.py), or build one. `make_table()` is only
+    called when the source has to be generated.
+    """
+    if key in _compiled:
+        _compiled.move_to_end(key)
+        return _compiled[key]
+
+    path = os.path.join(cache_dir, f"{key}.py") if cache_dir else f"<dfa {key[:12]}>"
+
+    source = None
+    if cache_dir and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        if _header_key(source) != key:
+            # Not the file this key would have generated: never run it
+            source = None
+
+    if source is None:
+        source = generate_source(make_table(), key)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(source)
+            os.replace(tmp_path, path)
+
+    matcher = _load(source, path)
+    _compiled[key] = matcher
+    if len(_compiled) > MAX_COMPILED:
+        _compiled.popitem(last=False)
+    return matcher
+
+
+def compile_table(table: DFATable, cache_dir: str = None):
+    """
+    Return a compiled `match(text) -> bool` function for a table.
+
+    If `cache_dir` is given, the generated source is stored there as
+    <table hash>.py and reused by later calls (and other processes).
+    """
+    return _compile(table_key(table), lambda: table, cache_dir)
+
+
+def regex_key(postfix_regex: str) -> str:
+    """Stable hash of a postfix regex, used to cache its matcher."""
+    return hashlib.sha256(f"postfix:{postfix_regex}".encode("utf-8")).hexdigest()
+
+
+def compile_code(table: DFATable) -> bytes:
+    """
+    Generate and compile a table's matcher into a marshalled code object.
+
+    Meant for a worker process: the result pickles (a function does not),
+    and load_code() in the parent only has to unmarshal and run it.
+    """
+    key = table_key(table)
+    return marshal.dumps(compile(generate_source(table, key), f"<dfa {key[:12]}>", "exec"))
+
+
+def load_code(code: bytes):
+    """Return the `match(text) -> bool` function of a compile_code() result."""
+    namespace = {}
+    exec(marshal.loads(code), namespace)
+    return namespace["match"]
+
+
+def clear_cache():
+    """Forget every matcher compiled in this process (files on disk are kept)."""
+    _compiled.clear()
+
+
+def compile_dfa(start_dfa, cache_dir: str = None):
+    """Minimize a DFA (from nfa_to_dfa or regex_to_dfa) and compile it."""
+    return compile_table(minimize_table(dfa_to_table(start_dfa)), cache_dir)
+
+
+def compile_regex(postfix_regex: str, cache_dir: str = None):
+    """
+    Postfix regex -> compiled matcher (see dfa_table.postfix_to_table).
+
+    The matcher is cached under the hash of the pattern itself, so a warm
+    start (in this process or from `cache_dir`) skips the NFA -> DFA ->
+    minimize build entirely, not only the source generation.
+    """
+    return _compile(regex_key(postfix_regex), lambda: postfix_to_table(postfix_regex), cache_dir)
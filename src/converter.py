@@ -1,6 +1,34 @@
 # franck
 
-from src.nfa_structure import State, NFA
+from src.nfa_structure import State, NFA, EPSILON
+
+
+def number_groups(postfix_regex: str) -> list:
+    """
+    Return the group number of every ')' in a capturing postfix regex, in
+    the order the ')' appear. Groups are numbered like in Python's re, by
+    the position of their opening parenthesis: the group whose first
+    symbol comes first is opened first, and of two groups starting on the
+    same symbol the outer one (closed later) was opened first.
+    """
+    stack = []       # first symbol position of each pending operand
+    groups = []      # (first symbol position, -close order)
+
+    for position, char in enumerate(postfix_regex):
+        if char in {'.', '|', '&'}:
+            stack.pop()
+        elif char == ')':
+            if not stack:
+                raise ValueError("Empty group: ')' has no operand to capture.")
+            groups.append((stack[-1], -len(groups)))
+        elif char not in {'*', '+', '?', '~'}:
+            stack.append(position)
+
+    order = sorted(range(len(groups)), key=lambda i: groups[i])
+    numbers = [0] * len(groups)
+    for number, close_index in enumerate(order):
+        numbers[close_index] = number
+    return numbers
 
 
 def postfix_to_nfa(postfix_regex: str) -> NFA:
@@ -15,14 +43,23 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
         - '+' is kleene plus (one or more)
         - '?' is zero or one
         - '&' is intersection
+        - ')' closes capturing group (from regex_shunting_yard(..., capture=True))
+
+    A group k is wrapped in two new states tagged with capture slots 2k
+    (group start) and 2k+1 (group end); see src/captures.py. Tags inside
+    the operands of '&' are not kept by the product construction.
+
+    Complement ('~') has no Thompson construction; use
+    src.derivatives.regex_to_dfa for expressions that contain it.
     """
 
     nfa_stack = []
+    group_numbers = iter(number_groups(postfix_regex))
 
     for char in postfix_regex:
 
         # 1. OPERAND (a, b, c, ...)
-        if char not in {'.', '|', '*', '+', '?', '&'}:
+        if char not in {'.', '|', '*', '+', '?', '&', '~', ')'}:
             start = State()
             accept = State(is_accepting=True)
             start.add_transition(char, accept)
@@ -34,7 +71,7 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
             nfa1 = nfa_stack.pop()
 
             nfa1.accept_state.is_accepting = False
-            nfa1.accept_state.add_transition("eps", nfa2.start_state)
+            nfa1.accept_state.add_transition(EPSILON, nfa2.start_state)
 
             new_nfa = NFA(nfa1.start_state, nfa2.accept_state)
             nfa_stack.append(new_nfa)
@@ -48,14 +85,14 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
             start = State()
             accept = State(is_accepting=True)
 
-            start.add_transition("eps", nfa1.start_state)
-            start.add_transition("eps", nfa2.start_state)
+            start.add_transition(EPSILON, nfa1.start_state)
+            start.add_transition(EPSILON, nfa2.start_state)
 
             nfa1.accept_state.is_accepting = False
             nfa2.accept_state.is_accepting = False
 
-            nfa1.accept_state.add_transition("eps", accept)
-            nfa2.accept_state.add_transition("eps", accept)
+            nfa1.accept_state.add_transition(EPSILON, accept)
+            nfa2.accept_state.add_transition(EPSILON, accept)
 
             new_nfa = NFA(start, accept)
             nfa_stack.append(new_nfa)
@@ -67,12 +104,12 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
             start = State()
             accept = State(is_accepting=True)
 
-            start.add_transition("eps", nfa1.start_state)
-            start.add_transition("eps", accept)
+            start.add_transition(EPSILON, nfa1.start_state)
+            start.add_transition(EPSILON, accept)
 
             nfa1.accept_state.is_accepting = False
-            nfa1.accept_state.add_transition("eps", nfa1.start_state)
-            nfa1.accept_state.add_transition("eps", accept)
+            nfa1.accept_state.add_transition(EPSILON, nfa1.start_state)
+            nfa1.accept_state.add_transition(EPSILON, accept)
 
             new_nfa = NFA(start, accept)
             nfa_stack.append(new_nfa)
@@ -85,11 +122,11 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
             start = State()
             accept = State(is_accepting=True)
 
-            start.add_transition("eps", nfa1.start_state)
+            start.add_transition(EPSILON, nfa1.start_state)
 
             nfa1.accept_state.is_accepting = False
-            nfa1.accept_state.add_transition("eps", nfa1.start_state)
-            nfa1.accept_state.add_transition("eps", accept)
+            nfa1.accept_state.add_transition(EPSILON, nfa1.start_state)
+            nfa1.accept_state.add_transition(EPSILON, accept)
 
             new_nfa = NFA(start, accept)
             nfa_stack.append(new_nfa)
@@ -102,11 +139,11 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
             accept = State(is_accepting=True)
 
             # either skip or take nfa1
-            start.add_transition("eps", nfa1.start_state)
-            start.add_transition("eps", accept)
+            start.add_transition(EPSILON, nfa1.start_state)
+            start.add_transition(EPSILON, accept)
 
             nfa1.accept_state.is_accepting = False
-            nfa1.accept_state.add_transition("eps", accept)
+            nfa1.accept_state.add_transition(EPSILON, accept)
 
             new_nfa = NFA(start, accept)
             nfa_stack.append(new_nfa)
@@ -136,31 +173,59 @@ def postfix_to_nfa(postfix_regex: str) -> NFA:
                 s1, s2 = queue.pop(0)
                 combined_state = get_pair_state(s1, s2)
 
-                # Find all transitions possible
+                # Epsilon moves are taken by one side at a time
+                moves = [(EPSILON, t1, s2) for t1 in s1.transitions.get(EPSILON, ())]
+                moves += [(EPSILON, s1, t2) for t2 in s2.transitions.get(EPSILON, ())]
+
+                # Symbol moves need the same label on both sides
                 for label1, targets1 in s1.transitions.items():
-                    for label2, targets2 in s2.transitions.items():
+                    if label1 == EPSILON or label1 not in s2.transitions:
+                        continue
+                    for t1 in targets1:
+                        for t2 in s2.transitions[label1]:
+                            moves.append((label1, t1, t2))
 
-                        # Intersection requires same label (except epsilon)
-                        if label1 == label2:
-                            for t1 in targets1:
-                                for t2 in targets2:
-                                    ns = get_pair_state(t1, t2)
-                                    combined_state.add_transition(label1, ns)
+                for label, t1, t2 in moves:
+                    ns = get_pair_state(t1, t2)
+                    combined_state.add_transition(label, ns)
 
-                                    if (t1, t2) not in visited:
-                                        visited.add((t1, t2))
-                                        queue.append((t1, t2))
+                    if (t1, t2) not in visited:
+                        visited.add((t1, t2))
+                        queue.append((t1, t2))
 
             # Accepting states = any pair where both are accepting
             accept = State(is_accepting=True)
 
             for (s1, s2), new_s in state_map.items():
                 if s1.is_accepting and s2.is_accepting:
-                    new_s.add_transition("eps", accept)
+                    new_s.add_transition(EPSILON, accept)
 
             new_nfa = NFA(start, accept)
             nfa_stack.append(new_nfa)
 
+        #  CAPTURING GROUP: tagged states around the fragment
+        elif char == ')':
+            if not nfa_stack:
+                raise ValueError("Empty group: ')' has no operand to capture.")
+            nfa1 = nfa_stack.pop()
+            group = next(group_numbers)
+
+            start = State()
+            accept = State(is_accepting=True)
+            start.tag = 2 * group
+            accept.tag = 2 * group + 1
+
+            start.add_transition(EPSILON, nfa1.start_state)
+
+            nfa1.accept_state.is_accepting = False
+            nfa1.accept_state.add_transition(EPSILON, accept)
+
+            new_nfa = NFA(start, accept)
+            nfa_stack.append(new_nfa)
+
+        elif char == '~':
+            raise ValueError("Complement '~' is not supported by Thompson's construction.")
+
         else:
             raise ValueError(f"Unexpected character in postfix regex: {char}")
 
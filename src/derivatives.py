@@ -0,0 +1,442 @@
+# src/derivatives.py
+
+import weakref
+from collections import deque
+
+
+class Regex:
+    """
+    A canonical (hash-consed) regular expression node.
+
+    Every structurally equal expression is represented by exactly one
+    Regex object, so nodes can be compared with `is`, used as dict keys
+    by identity, and carry cached data (nullability, derivatives).
+    Nodes must be built through the smart constructors below, never directly.
+
+    The hash-consing table only holds weak references: a node (and the
+    derivatives memoized on it) is freed once nothing uses it any more,
+    so a long-running process does not keep every expression it ever saw.
+
+    kind -> one of EMPTY, EPSILON, SYMBOL, CONCAT, STAR, UNION, INTER, NOT
+    args -> tuple of child nodes (or the symbol character for SYMBOL)
+    """
+    __slots__ = ("kind", "args", "uid", "nullable", "_derivatives", "_covers", "__weakref__")
+
+    _table = weakref.WeakValueDictionary()     # (kind, child uids) -> Regex, the hash-consing table
+    _counter = 0
+
+    def __new__(cls, kind, args):
+        # Children are keyed by uid: a key holding the nodes themselves
+        # would keep them alive for as long as their parent's entry exists
+        key = (kind, args if kind == SYMBOL else tuple(r.uid for r in args))
+        node = cls._table.get(key)
+        if node is not None:
+            return node
+
+        node = super().__new__(cls)
+        node.kind = kind
+        node.args = args
+        node.uid = Regex._counter
+        Regex._counter += 1
+        node.nullable = _compute_nullable(kind, args)
+        node._derivatives = {}   # symbol -> Regex
+        node._covers = ()        # same-kind nodes whose args are all in ours
+
+        cls._table[key] = node
+        return node
+
+    def __repr__(self):
+        return f"Regex({to_string(self)})"
+
+
+# Node kinds
+EMPTY = "empty"        # matches nothing
+EPSILON = "epsilon"    # matches only the empty string
+SYMBOL = "symbol"
+CONCAT = "concat"
+STAR = "star"
+UNION = "union"
+INTER = "inter"
+NOT = "not"
+
+
+def _compute_nullable(kind, args):
+    """Return True if the node accepts the empty string."""
+    if kind in (EPSILON, STAR):
+        return True
+    if kind in (EMPTY, SYMBOL):
+        return False
+    if kind in (CONCAT, INTER):
+        return all(r.nullable for r in args)
+    if kind == UNION:
+        return any(r.nullable for r in args)
+    if kind == NOT:
+        return not args[0].nullable
+    raise ValueError(f"Unknown regex kind: {kind}")
+
+
+# ------------------------------------------------------------------
+# Smart constructors
+# They apply the usual algebraic identities so that every expression is
+# kept in a normal form. Union is associative, commutative and idempotent
+# (ACI), which is what guarantees a finite number of distinct derivatives.
+# ------------------------------------------------------------------
+
+def empty() -> Regex:
+    return Regex(EMPTY, ())
+
+
+def epsilon() -> Regex:
+    return Regex(EPSILON, ())
+
+
+def anything() -> Regex:
+    """Σ*, written as the complement of the empty language."""
+    return complement(empty())
+
+
+def symbol(char: str) -> Regex:
+    return Regex(SYMBOL, char)
+
+
+def concat(r: Regex, s: Regex) -> Regex:
+    if r.kind == EMPTY or s.kind == EMPTY:
+        return empty()
+    if r.kind == EPSILON:
+        return s
+    if s.kind == EPSILON:
+        return r
+    # Keep concatenation right-associated: (ab)c -> a(bc). The factors of
+    # r are collected first and folded from the right, so long chains do
+    # not recurse once per symbol.
+    factors = []
+    while r.kind == CONCAT:
+        factors.append(r.args[0])
+        r = r.args[1]
+    result = Regex(CONCAT, (r, s))
+    for head in reversed(factors):
+        result = Regex(CONCAT, (head, result))
+    return result
+
+
+def concat_all(factors: list) -> Regex:
+    """Concatenation of a list of expressions, built from the right."""
+    result = epsilon()
+    for r in reversed(factors):
+        result = concat(r, result)
+    return result
+
+
+def star(r: Regex) -> Regex:
+    if r.kind == STAR:
+        return r
+    if r.kind in (EMPTY, EPSILON):
+        return epsilon()
+    return Regex(STAR, (r,))
+
+
+def complement(r: Regex) -> Regex:
+    if r.kind == NOT:
+        return r.args[0]
+    return Regex(NOT, (r,))
+
+
+def _flatten(kind, operands):
+    """
+    Collect the operands of nested nodes of the same kind into one set.
+
+    Largest nodes go first, and a node already covered by one that was
+    absorbed (see _covers) is skipped without touching its args. The
+    derivatives of a chain like a?a?a?... are nested unions, each built
+    from the next one, so this keeps their union linear instead of
+    quadratic.
+    """
+    result = set()
+    covered = set()
+    ordered = sorted(operands, key=lambda r: len(r.args) if r.kind == kind else 0, reverse=True)
+    for r in ordered:
+        if r.kind != kind:
+            result.add(r)
+            continue
+        if r in covered:
+            continue
+        result.update(r.args)
+        covered.add(r)
+        stack = [r]
+        while stack:
+            for sub in stack.pop()._covers:
+                if sub not in covered:
+                    covered.add(sub)
+                    stack.append(sub)
+    return result
+
+
+def _make(kind, parts, operands) -> Regex:
+    """Intern an n-ary node and remember which operand nodes it covers."""
+    node = Regex(kind, tuple(sorted(parts, key=lambda r: r.uid)))
+    if not node._covers:
+        node._covers = tuple(r for r in operands if r.kind == kind)
+    return node
+
+
+def union(*operands: Regex) -> Regex:
+    parts = _flatten(UNION, operands)
+    parts.discard(empty())
+
+    if anything() in parts:
+        return anything()
+    if not parts:
+        return empty()
+    if len(parts) == 1:
+        return parts.pop()
+    return _make(UNION, parts, operands)
+
+
+def intersect(*operands: Regex) -> Regex:
+    parts = _flatten(INTER, operands)
+
+    if empty() in parts:
+        return empty()
+    parts.discard(anything())
+    if not parts:
+        return anything()
+    if len(parts) == 1:
+        return parts.pop()
+    return _make(INTER, parts, operands)
+
+
+def clear_cache():
+    """
+    Forget every interned node. Nodes that are no longer used are freed
+    automatically; this also drops the ones still referenced, which are
+    then no longer canonical, so only call it between independent builds.
+    """
+    Regex._table.clear()
+
+
+# ------------------------------------------------------------------
+# Derivatives
+# ------------------------------------------------------------------
+
+def derivative(r: Regex, char: str) -> Regex:
+    """
+    Return the Brzozowski derivative of `r` with respect to `char`:
+    the expression matching { w | char + w is matched by r }.
+    Results are memoized on the node.
+    """
+    cached = r._derivatives.get(char)
+    if cached is not None:
+        return cached
+
+    kind = r.kind
+    if kind in (EMPTY, EPSILON):
+        result = empty()
+    elif kind == SYMBOL:
+        result = epsilon() if r.args == char else empty()
+    elif kind == CONCAT:
+        # d(h.t) = d(h).t, plus d(t) when h is nullable. A run of nullable
+        # heads (a?a?a?...) is collected first and derived from the
+        # deepest tail up, memoizing every tail on the way, so it does not
+        # recurse once per head.
+        chain = [r]
+        while True:
+            head, tail = chain[-1].args
+            if not head.nullable or tail.kind != CONCAT or char in tail._derivatives:
+                break
+            chain.append(tail)
+
+        for node in reversed(chain):
+            head, tail = node.args
+            result = concat(derivative(head, char), tail)
+            if head.nullable:
+                result = union(result, derivative(tail, char))
+            node._derivatives[char] = result
+    elif kind == STAR:
+        result = concat(derivative(r.args[0], char), r)
+    elif kind == UNION:
+        result = union(*(derivative(s, char) for s in r.args))
+    elif kind == INTER:
+        result = intersect(*(derivative(s, char) for s in r.args))
+    elif kind == NOT:
+        result = complement(derivative(r.args[0], char))
+    else:
+        raise ValueError(f"Unknown regex kind: {kind}")
+
+    r._derivatives[char] = result
+    return result
+
+
+def symbols_of(r: Regex) -> set:
+    """Return the set of symbols that appear in the expression."""
+    result = set()
+    stack = [r]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        if node.kind == SYMBOL:
+            result.add(node.args)
+        elif node.kind not in (EMPTY, EPSILON):
+            stack.extend(node.args)
+    return result
+
+
+def to_string(r: Regex) -> str:
+    """Render a node back to (fully parenthesized) infix notation."""
+    kind = r.kind
+    if kind == EMPTY:
+        return "∅"
+    if kind == EPSILON:
+        return "ε"
+    if kind == SYMBOL:
+        return r.args
+    if kind == CONCAT:
+        return f"{to_string(r.args[0])}{to_string(r.args[1])}"
+    if kind == STAR:
+        return f"({to_string(r.args[0])})*"
+    if kind == UNION:
+        return "(" + "|".join(to_string(s) for s in r.args) + ")"
+    if kind == INTER:
+        return "(" + "&".join(to_string(s) for s in r.args) + ")"
+    return f"~({to_string(r.args[0])})"
+
+
+# ------------------------------------------------------------------
+# Postfix -> expression
+# ------------------------------------------------------------------
+
+def postfix_to_regex(postfix_regex: str) -> Regex:
+    """
+    Build a canonical expression from a postfix regular expression.
+
+    Accepts the same operators as postfix_to_nfa, plus:
+        - '~' is complement (unary)
+
+    Chains of '.' are kept as lists of factors until another operator
+    needs them, then built from the right in one pass: a long literal
+    such as "ab.c.d." costs linear time instead of one re-association
+    of the whole chain per symbol.
+    """
+    stack = []
+
+    def pop():
+        item = stack.pop()
+        return concat_all(item) if isinstance(item, list) else item
+
+    for char in postfix_regex:
+        if char not in {'.', '|', '*', '+', '?', '&', '~'}:
+            stack.append(symbol(char))
+
+        elif char == '.':
+            r2 = stack.pop()
+            r1 = stack.pop()
+            factors = r1 if isinstance(r1, list) else [r1]
+            factors.extend(r2 if isinstance(r2, list) else [r2])
+            stack.append(factors)
+
+        elif char in {'|', '&'}:
+            r2 = pop()
+            r1 = pop()
+            if char == '|':
+                stack.append(union(r1, r2))
+            else:
+                stack.append(intersect(r1, r2))
+
+        else:
+            r1 = pop()
+            if char == '*':
+                stack.append(star(r1))
+            elif char == '+':
+                stack.append(concat(r1, star(r1)))
+            elif char == '?':
+                stack.append(union(r1, epsilon()))
+            else:
+                stack.append(complement(r1))
+
+    if len(stack) != 1:
+        raise ValueError("Invalid postfix expression: stack does not contain exactly one expression at the end.")
+
+    return pop()
+
+
+# ------------------------------------------------------------------
+# DFA construction
+# ------------------------------------------------------------------
+
+class DerivativeDFAState:
+    """
+    A DFA state built by the derivative engine. It is identified by the
+    canonical expression it still has to match, and exposes the same
+    `transitions` / `is_accept` interface as nfa_dfa.DFAState.
+    """
+    def __init__(self, expr: Regex):
+        self.expr = expr
+        self.transitions = {}                     # symbol -> DerivativeDFAState
+        self.is_accept = expr.nullable
+
+    def __repr__(self):
+        return f"DerivativeDFAState({to_string(self.expr)})"
+
+
+def regex_to_dfa(regex, alphabet=None):
+    """
+    Build a DFA directly from an expression by repeated derivation.
+
+    `regex` is either a Regex node or a postfix string. Intersection and
+    complement are handled natively, without a product construction.
+    Complement is taken relative to `alphabet`, which defaults to the
+    symbols appearing in the expression.
+
+    Returns the start DFA state and a dict of all DFA states (keyed by
+    expression), the same shape as nfa_to_dfa. As in nfa_to_dfa, the dead
+    state (the empty language) is left out: a missing transition rejects.
+    """
+    if isinstance(regex, str):
+        regex = postfix_to_regex(regex)
+    if alphabet is None:
+        alphabet = symbols_of(regex)
+    alphabet = sorted(alphabet)
+
+    start_dfa = DerivativeDFAState(regex)
+    dfa_states = {regex: start_dfa}
+    queue = deque([start_dfa])
+
+    while queue:
+        dfa_state = queue.popleft()
+
+        for char in alphabet:
+            target = derivative(dfa_state.expr, char)
+            if target.kind == EMPTY:
+                continue
+
+            if target not in dfa_states:
+                new_dfa = DerivativeDFAState(target)
+                dfa_states[target] = new_dfa
+                queue.append(new_dfa)
+
+            dfa_state.transitions[char] = dfa_states[target]
+
+    return start_dfa, dfa_states
+
+
+def matches(regex, text: str, alphabet=None) -> bool:
+    """
+    Match `text` against an expression by deriving it symbol by symbol.
+
+    Follows the same rule as regex_to_dfa: the language lives over
+    `alphabet` (by default the symbols appearing in the expression), so a
+    symbol outside it is rejected, even under a complement.
+    """
+    if isinstance(regex, str):
+        regex = postfix_to_regex(regex)
+    if alphabet is None:
+        alphabet = symbols_of(regex)
+    for char in text:
+        if char not in alphabet:
+            return False
+        regex = derivative(regex, char)
+        if regex.kind == EMPTY:
+            return False
+    return regex.nullable
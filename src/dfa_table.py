@@ -0,0 +1,244 @@
+# src/dfa_table.py
+
+import hashlib
+from collections import deque
+
+from src.converter import postfix_to_nfa
+from src.nfa_reduction import reduce_nfa
+from src.nfa_dfa import nfa_to_dfa
+from src.derivatives import regex_to_dfa
+
+
+class DFATable:
+    """
+    Compact, integer-numbered form of a DFA.
+
+    symbols     -> sorted list of the input symbols
+    transitions -> one dict per state: symbol -> target state number
+    accepting   -> one bool per state
+
+    State 0 is always the start state. A missing transition means the
+    input is rejected (there is no explicit dead state).
+    """
+    __slots__ = ("symbols", "transitions", "accepting")
+
+    def __init__(self, symbols, transitions, accepting):
+        self.symbols = symbols
+        self.transitions = transitions
+        self.accepting = accepting
+
+    def __len__(self):
+        return len(self.transitions)
+
+    def __repr__(self):
+        return f"DFATable(states={len(self)}, symbols={len(self.symbols)})"
+
+
+def dfa_to_table(start_dfa) -> DFATable:
+    """
+    Number the states of a DFA (from nfa_to_dfa or regex_to_dfa) in
+    breadth-first order, visiting symbols in sorted order, so the same
+    DFA always gives the same table.
+    """
+    numbers = {start_dfa: 0}
+    order = [start_dfa]
+    queue = deque([start_dfa])
+    symbols = set()
+
+    while queue:
+        dfa_state = queue.popleft()
+        for symbol in sorted(dfa_state.transitions):
+            symbols.add(symbol)
+            target = dfa_state.transitions[symbol]
+            if target not in numbers:
+                numbers[target] = len(order)
+                order.append(target)
+                queue.append(target)
+
+    transitions = [
+        {symbol: numbers[target] for symbol, target in sorted(s.transitions.items())}
+        for s in order
+    ]
+    accepting = [s.is_accept for s in order]
+    return DFATable(sorted(symbols), transitions, accepting)
+
+
+def _renumber(symbols, transitions, accepting, start) -> DFATable:
+    """Keep the states reachable from `start`, numbered in canonical BFS order."""
+    numbers = {start: 0}
+    order = [start]
+    queue = deque([start])
+
+    while queue:
+        state = queue.popleft()
+        for symbol in sorted(transitions[state]):
+            target = transitions[state][symbol]
+            if target not in numbers:
+                numbers[target] = len(order)
+                order.append(target)
+                queue.append(target)
+
+    new_transitions = [
+        {symbol: numbers[target] for symbol, target in sorted(transitions[s].items())}
+        for s in order
+    ]
+    used = sorted({symbol for row in new_transitions for symbol in row})
+    return DFATable(used, new_transitions, [accepting[s] for s in order])
+
+
+def _hopcroft(n, symbols, transitions, accepting):
+    """
+    Hopcroft's partition refinement on a complete DFA with states 0..n-1
+    (`transitions[s][sym]` is always set). Returns (block of every state,
+    number of blocks).
+
+    A worklist holds the blocks still to be used as splitters. For each
+    splitter and symbol, only the blocks that have a predecessor in the
+    splitter are looked at; when one is split, the smaller half is
+    queued (or both halves, if the block was queued already). Every state
+    is therefore re-queued O(log n) times: O(k n log n) overall.
+    """
+    # inverse[sym][t] -> states with a transition to t on sym
+    inverse = {sym: [[] for _ in range(n)] for sym in symbols}
+    for source in range(n):
+        row = transitions[source]
+        for sym in symbols:
+            inverse[sym][row[sym]].append(source)
+
+    accept_block = {s for s in range(n) if accepting[s]}
+    reject_block = set(range(n)) - accept_block
+    blocks = [b for b in (accept_block, reject_block) if b]
+    block_of = [0] * n
+    for b, members in enumerate(blocks):
+        for s in members:
+            block_of[s] = b
+
+    pending = {min(range(len(blocks)), key=lambda b: len(blocks[b]))}
+    worklist = list(pending)
+
+    while worklist:
+        splitter = worklist.pop()
+        pending.discard(splitter)
+        splitter_states = list(blocks[splitter])
+
+        for sym in symbols:
+            inv = inverse[sym]
+            # Predecessors of the splitter, grouped by their block
+            touched = {}
+            for t in splitter_states:
+                for s in inv[t]:
+                    touched.setdefault(block_of[s], set()).add(s)
+
+            for b, inside in touched.items():
+                if len(inside) == len(blocks[b]):
+                    continue
+                # Split b into (b - inside) and a new block `inside`
+                blocks[b] -= inside
+                new = len(blocks)
+                blocks.append(inside)
+                for s in inside:
+                    block_of[s] = new
+                if b in pending:
+                    pending.add(new)
+                    worklist.append(new)
+                else:
+                    smaller = new if len(inside) <= len(blocks[b]) else b
+                    pending.add(smaller)
+                    worklist.append(smaller)
+
+    return block_of, len(blocks)
+
+
+def minimize_table(table: DFATable) -> DFATable:
+    """
+    Return the minimal DFA for the same language.
+
+    1. States that cannot reach an accepting state are dropped (their
+       incoming transitions become missing transitions).
+    2. The remaining states, plus one explicit dead state standing for
+       every missing transition, are merged with Hopcroft's algorithm.
+       The dead state ends up alone in its block, which is dropped again.
+    """
+    n = len(table)
+
+    # 1. Co-reachability: walk the reversed transitions from accepting states
+    incoming = [[] for _ in range(n)]
+    for state, row in enumerate(table.transitions):
+        for target in row.values():
+            incoming[target].append(state)
+
+    alive = set(s for s in range(n) if table.accepting[s])
+    stack = list(alive)
+    while stack:
+        for source in incoming[stack.pop()]:
+            if source not in alive:
+                alive.add(source)
+                stack.append(source)
+
+    if 0 not in alive:
+        # Empty language: a single rejecting state
+        return DFATable([], [{}], [False])
+
+    # 2. Complete DFA over the alive states; `dead` is the last state
+    order = sorted(alive)
+    number = {s: i for i, s in enumerate(order)}
+    dead = len(order)
+    symbols = table.symbols
+    complete = []
+    for s in order:
+        row = table.transitions[s]
+        complete.append({
+            sym: number[row[sym]] if sym in row and row[sym] in alive else dead
+            for sym in symbols
+        })
+    complete.append({sym: dead for sym in symbols})
+    accepting = [table.accepting[s] for s in order] + [False]
+
+    block, block_count = _hopcroft(dead + 1, symbols, complete, accepting)
+
+    # One representative per block; its transitions point at blocks
+    dead_block = block[dead]
+    representative = {}
+    for s in range(dead):
+        representative.setdefault(block[s], s)
+
+    merged_transitions = [{} for _ in range(block_count)]
+    merged_accepting = [False] * block_count
+    for b, s in representative.items():
+        merged_transitions[b] = {
+            sym: block[t] for sym, t in complete[s].items() if block[t] != dead_block
+        }
+        merged_accepting[b] = accepting[s]
+
+    return _renumber(symbols, merged_transitions, merged_accepting, block[number[0]])
+
+
+def postfix_to_table(postfix_regex: str) -> DFATable:
+    """
+    Postfix regex -> minimized DFATable, through postfix_to_nfa, reduce_nfa
+    and nfa_to_dfa. Complement ('~') has no Thompson construction, so a
+    regex using it is built with the derivative engine instead.
+    """
+    if '~' in postfix_regex:
+        start_dfa, _ = regex_to_dfa(postfix_regex)
+    else:
+        reduced, _ = reduce_nfa(postfix_to_nfa(postfix_regex))
+        start_dfa, _ = nfa_to_dfa(reduced)
+    return minimize_table(dfa_to_table(start_dfa))
+
+
+def table_accepts(table: DFATable, text) -> bool:
+    """Table interpreter: run the DFA over `text` one symbol at a time."""
+    transitions = table.transitions
+    state = 0
+    for symbol in text:
+        state = transitions[state].get(symbol)
+        if state is None:
+            return False
+    return table.accepting[state]
+
+
+def table_key(table: DFATable) -> str:
+    """Stable hash of a table; equal tables give equal keys."""
+    text = repr((table.symbols, table.transitions, table.accepting))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
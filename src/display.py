@@ -1,6 +1,5 @@
 # taku
-from graphviz import Digraph
-from src.nfa_structure import NFA, State
+from src.nfa_structure import NFA, State, EPSILON
 
 
 def display_nfa(nfa: NFA, output_filename: str = "nfa_graph") -> None:
@@ -14,6 +13,8 @@ def display_nfa(nfa: NFA, output_filename: str = "nfa_graph") -> None:
     Returns:
         None — This function writes files to disk (.gv and .png).
     """
+    # Imported here so that modules which never draw don't pay for graphviz
+    from graphviz import Digraph
 
     # Create directed graph
     graph = Digraph(format="png")
@@ -50,7 +51,7 @@ def display_nfa(nfa: NFA, output_filename: str = "nfa_graph") -> None:
             for target in target_states:
 
                 # Label ε transitions correctly
-                label = symbol if symbol != "" else "ε"
+                label = symbol if symbol != EPSILON else "ε"
 
                 graph.edge(
                     str(id(state)),
@@ -0,0 +1,251 @@
+# src/factoring.py
+
+"""
+Alternation factoring: a rewrite pass on postfix regexes that runs before
+postfix_to_nfa.
+
+Thompson's construction gives every branch of a union its own chain of
+states, so `alpha|alphabet|alpine` costs one chain per word and the union
+start state fans out to all of them. This pass rewrites unions so that
+branches sharing a prefix share its states (a prefix trie):
+
+    alpha|alphabet|alpine   ->   alp(ha(bet)?|ine)
+
+and branches whose remaining tails are identical share the tail:
+
+    cat|bat|rat             ->   (c|b|r)at
+
+The result accepts exactly the same language, so it can be fed to any
+engine that reads postfix regexes.
+"""
+
+_OPERATORS = {'.', '|', '*', '+', '?', '&', '~'}
+
+
+# ------------------------------------------------------------------
+# Postfix <-> tree
+#   ("sym", c)   ("cat", (nodes...))   ("alt", (nodes...))
+#   ("*" | "+" | "?" | "~", node)     ("&", (left, right))
+# ------------------------------------------------------------------
+
+def _parse(postfix_regex: str):
+    """Parse a postfix regex into a tree, flattening '.' and '|' chains."""
+    stack = []
+
+    for char in postfix_regex:
+        if char not in _OPERATORS:
+            stack.append(("sym", char))
+
+        elif char in {'.', '|'}:
+            op = "cat" if char == '.' else "alt"
+            right = stack.pop()
+            left = stack.pop()
+            # Children are kept in a list while the chain is being built
+            children = left[1] if left[0] == op else [left]
+            children.extend(right[1] if right[0] == op else [right])
+            stack.append((op, children))
+
+        elif char == '&':
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(("&", (left, right)))
+
+        else:
+            stack.append((char, stack.pop()))
+
+    if len(stack) != 1:
+        raise ValueError("Invalid postfix expression: stack does not contain exactly one NFA at the end.")
+
+    return _freeze(stack.pop())
+
+
+def _child_nodes(node):
+    op, arg = node
+    if op == "sym":
+        return ()
+    if op in ("cat", "alt", "&"):
+        return arg
+    return (arg,)
+
+
+def _transform(node, combine):
+    """
+    Rebuild a tree bottom-up: combine(node, children results) is called
+    on every node after all its children. Uses an explicit stack, so
+    deeply nested regexes are fine.
+    """
+    results = []
+    stack = [(node, False)]
+
+    while stack:
+        item, children_done = stack.pop()
+        children = _child_nodes(item)
+        if children and not children_done:
+            stack.append((item, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+
+        if children:
+            values = results[-len(children):]
+            del results[-len(children):]
+        else:
+            values = []
+        results.append(combine(item, values))
+
+    return results.pop()
+
+
+def _freeze_node(node, children):
+    op, arg = node
+    if op == "sym":
+        return node
+    if op in ("cat", "alt", "&"):
+        return (op, tuple(children))
+    return (op, children[0])
+
+
+def _freeze(node):
+    """Turn the lists used while parsing into tuples, so nodes are hashable."""
+    return _transform(node, _freeze_node)
+
+
+def _to_postfix(node, out: list):
+    """Write a tree back as postfix. Uses an explicit stack, so deep trees are fine."""
+    # Stack items are tree nodes (tuples) or operator characters to emit
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.append(item)
+            continue
+
+        op, arg = item
+        if op == "sym":
+            out.append(arg)
+        elif op in ("cat", "alt", "&"):
+            symbol = {"cat": ".", "alt": "|", "&": "&"}[op]
+            todo = [arg[0]]
+            for child in arg[1:]:
+                todo += [child, symbol]
+            stack.extend(reversed(todo))
+        else:
+            stack += [op, arg]
+
+
+# ------------------------------------------------------------------
+# Smart constructors (None stands for the empty string)
+# ------------------------------------------------------------------
+
+def _concat(items: list):
+    items = [item for item in items if item is not None]
+    flat = []
+    for item in items:
+        flat.extend(item[1] if item[0] == "cat" else (item,))
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return ("cat", tuple(flat))
+
+
+def _union(items: list):
+    """Union of the items; an empty-string item turns the rest optional."""
+    optional = any(item is None for item in items)
+    unique = list(dict.fromkeys(item for item in items if item is not None))
+
+    if not unique:
+        return None
+    result = unique[0] if len(unique) == 1 else ("alt", tuple(unique))
+    if optional and result[0] not in ("*", "?"):
+        result = ("?", result)
+    return result
+
+
+# ------------------------------------------------------------------
+# Factoring
+# ------------------------------------------------------------------
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children = {}    # atom -> _TrieNode (insertion ordered)
+        self.terminal = False
+
+
+def _factor_union(branches: tuple):
+    """
+    Build a prefix trie over the branches of one union (each branch seen
+    as a sequence of atoms: symbols or any other sub-tree) and emit it
+    back as a tree, merging siblings whose tails are identical.
+    """
+    root = _TrieNode()
+    for branch in branches:
+        atoms = branch[1] if branch[0] == "cat" else (branch,)
+        node = root
+        for atom in atoms:
+            node = node.children.setdefault(atom, _TrieNode())
+        node.terminal = True
+
+    return _emit(root)
+
+
+def _emit(root):
+    """
+    Turn a trie back into a tree, children before parents (an explicit
+    post-order walk, so branches thousands of symbols long are fine).
+    """
+    emitted = {}    # _TrieNode -> tree, until its parent has used it
+    stack = [(root, False)]
+
+    while stack:
+        trie_node, children_done = stack.pop()
+        if not children_done:
+            stack.append((trie_node, True))
+            stack.extend((child, False) for child in trie_node.children.values())
+            continue
+
+        # Group the outgoing atoms by the expression that follows them
+        by_tail = {}
+        for atom, child in trie_node.children.items():
+            by_tail.setdefault(emitted.pop(child), []).append(atom)
+
+        alternatives = [
+            _concat([_union(atoms), tail]) for tail, atoms in by_tail.items()
+        ]
+        if trie_node.terminal:
+            alternatives.append(None)
+
+        emitted[trie_node] = _union(alternatives)
+
+    return emitted[root]
+
+
+def _optimize_node(node, children):
+    op, arg = node
+    if op == "sym":
+        return node
+    if op == "cat":
+        return _concat(children)
+    if op == "alt":
+        return _factor_union(tuple(children))
+    if op == "&":
+        return ("&", tuple(children))
+    return (op, children[0])
+
+
+def _optimize(node):
+    return _transform(node, _optimize_node)
+
+
+def factor_alternations(postfix_regex: str) -> str:
+    """
+    Rewrite every union in a postfix regex into a prefix trie with shared
+    tails. Returns an equivalent postfix regex.
+
+    Example:
+        "ab.c.ab.d.|"  (abc|abd)  ->  "ab.cd|."  (ab(c|d))
+    """
+    out = []
+    _to_postfix(_optimize(_parse(postfix_regex)), out)
+    return "".join(out)
@@ -0,0 +1,316 @@
+# src/fragments.py
+
+from src.nfa_structure import State, NFA, EPSILON
+
+
+class Fragment:
+    """
+    Immutable Thompson fragment.
+
+    States are local integers 0 .. size-1. `edges` holds only the
+    (source, symbol, target) triples this fragment adds itself, and
+    `parts` places its child fragments inside it as (offset, Fragment)
+    pairs: the child's state i is this fragment's state offset + i.
+    Children are referenced, not copied, so a fragment costs memory for
+    its own glue edges only, and the same child can be shared by any
+    number of larger fragments (and by any number of compiled regexes).
+    Unlike the NFA objects built by postfix_to_nfa, a fragment is never
+    modified after it is created.
+    """
+    __slots__ = ("size", "start", "accept", "edges", "parts")
+
+    def __init__(self, size: int, start: int, accept: int, edges: tuple, parts: tuple = ()):
+        self.size = size
+        self.start = start
+        self.accept = accept
+        self.edges = edges
+        self.parts = parts
+
+    def all_edges(self):
+        """Yield every edge of the fragment, children included, in local numbering."""
+        stack = [(self, 0)]
+        while stack:
+            fragment, base = stack.pop()
+            for src, sym, dst in fragment.edges:
+                yield src + base, sym, dst + base
+            for offset, part in fragment.parts:
+                stack.append((part, base + offset))
+
+    def __repr__(self):
+        return f"Fragment(states={self.size}, edges={len(self.edges)}, parts={len(self.parts)})"
+
+
+# ------------------------------------------------------------------
+# Fragment builders (Thompson's construction without mutation)
+# ------------------------------------------------------------------
+
+def symbol_fragment(char: str) -> Fragment:
+    return Fragment(2, 0, 1, ((0, char, 1),))
+
+
+def concat_fragment(parts: list) -> Fragment:
+    """a.b.c... : link each accept state to the next start state."""
+    edges = []
+    placed = []
+    offset = 0
+    previous_accept = None
+    start = None
+
+    for part in parts:
+        placed.append((offset, part))
+        if previous_accept is None:
+            start = part.start + offset
+        else:
+            edges.append((previous_accept, EPSILON, part.start + offset))
+        previous_accept = part.accept + offset
+        offset += part.size
+
+    return Fragment(offset, start, previous_accept, tuple(edges), tuple(placed))
+
+
+def union_fragment(parts: list) -> Fragment:
+    """a|b|c... : new start and accept states around every branch."""
+    edges = []
+    placed = []
+    offset = 2      # 0 = new start, 1 = new accept
+
+    for part in parts:
+        placed.append((offset, part))
+        edges.append((0, EPSILON, part.start + offset))
+        edges.append((part.accept + offset, EPSILON, 1))
+        offset += part.size
+
+    return Fragment(offset, 0, 1, tuple(edges), tuple(placed))
+
+
+def repeat_fragment(part: Fragment, op: str) -> Fragment:
+    """'*', '+' or '?' applied to one fragment, as in postfix_to_nfa."""
+    inner_start = part.start + 2
+    inner_accept = part.accept + 2
+
+    edges = [(0, EPSILON, inner_start), (inner_accept, EPSILON, 1)]
+    if op in "*+":
+        edges.append((inner_accept, EPSILON, inner_start))   # loop back
+    if op in "*?":
+        edges.append((0, EPSILON, 1))                         # skip
+
+    return Fragment(part.size + 2, 0, 1, tuple(edges), ((2, part),))
+
+
+def intersect_fragment(left: Fragment, right: Fragment) -> Fragment:
+    """
+    a&b : product of the two fragments. Epsilon moves are taken by one
+    side at a time; symbol moves must be taken by both sides together.
+    """
+    def outgoing(fragment):
+        table = [[] for _ in range(fragment.size)]
+        for src, sym, dst in fragment.all_edges():
+            table[src].append((sym, dst))
+        return table
+
+    left_out = outgoing(left)
+    right_out = outgoing(right)
+
+    pair_ids = {}
+    edges = []
+
+    def pair_id(p, q):
+        if (p, q) not in pair_ids:
+            pair_ids[(p, q)] = len(pair_ids) + 1    # 0 is reserved for accept
+            queue.append((p, q))
+        return pair_ids[(p, q)]
+
+    queue = []
+    start = pair_id(left.start, right.start)
+
+    while queue:
+        p, q = queue.pop()
+        current = pair_ids[(p, q)]
+
+        for sym, p2 in left_out[p]:
+            if sym == EPSILON:
+                edges.append((current, EPSILON, pair_id(p2, q)))
+        for sym, q2 in right_out[q]:
+            if sym == EPSILON:
+                edges.append((current, EPSILON, pair_id(p, q2)))
+        for sym1, p2 in left_out[p]:
+            if sym1 == EPSILON:
+                continue
+            for sym2, q2 in right_out[q]:
+                if sym1 == sym2:
+                    edges.append((current, sym1, pair_id(p2, q2)))
+
+    if (left.accept, right.accept) in pair_ids:
+        edges.append((pair_ids[(left.accept, right.accept)], EPSILON, 0))
+
+    return Fragment(len(pair_ids) + 1, start, 0, tuple(edges))
+
+
+def fragment_to_nfa(fragment: Fragment) -> NFA:
+    """Instantiate a fragment (and every fragment it references) as a fresh, mutable NFA."""
+    states = [State() for _ in range(fragment.size)]
+    for src, sym, dst in fragment.all_edges():
+        states[src].add_transition(sym, states[dst])
+
+    accept = states[fragment.accept]
+    accept.is_accepting = True
+    return NFA(states[fragment.start], accept)
+
+
+# ------------------------------------------------------------------
+# Hash-consing cache
+# ------------------------------------------------------------------
+
+class FragmentCache:
+    """
+    Builds fragments from postfix regexes, sharing work between compiles.
+
+    Every sub-expression is normalized and interned to an integer id:
+        ("sym", c)           a symbol
+        ("cat", (ids...))    concatenation, flattened
+        ("alt", (ids...))    union, flattened, sorted and de-duplicated
+        ("*" | "+" | "?", id)
+        ("&", (id1, id2))
+
+    Fragments are cached by id, so when one alternative of a large
+    pattern changes, only that alternative and the nodes above it are
+    rebuilt; every other sub-expression is taken from the cache.
+    """
+
+    def __init__(self):
+        self._ids = {}          # normalized key -> expression id
+        self._keys = []         # expression id -> normalized key
+        self._fragments = {}    # expression id -> Fragment
+        self.hits = 0
+        self.misses = 0
+
+    def _intern(self, key) -> int:
+        expr_id = self._ids.get(key)
+        if expr_id is None:
+            expr_id = len(self._keys)
+            self._ids[key] = expr_id
+            self._keys.append(key)
+        return expr_id
+
+    def _finish(self, item) -> int:
+        """Intern a pending n-ary node left on the parse stack."""
+        if isinstance(item, int):
+            return item
+        op, children = item
+        if op == "alt":
+            children = sorted(set(children))
+        if len(children) == 1:
+            return children[0]
+        return self._intern((op, tuple(children)))
+
+    def _children(self, item, op) -> list:
+        """Operands of `item` to splice into an n-ary node of kind `op`."""
+        if not isinstance(item, int):
+            if item[0] == op:
+                return item[1]
+            item = self._finish(item)
+        key = self._keys[item]
+        if key[0] == op:
+            return list(key[1])
+        return [item]
+
+    def parse(self, postfix_regex: str) -> int:
+        """Return the interned id of a postfix regex."""
+        stack = []
+
+        for char in postfix_regex:
+            if char not in {'.', '|', '*', '+', '?', '&', '~'}:
+                stack.append(self._intern(("sym", char)))
+
+            elif char in {'.', '|'}:
+                op = "cat" if char == '.' else "alt"
+                right = stack.pop()
+                left = stack.pop()
+                # Pending n-ary nodes are extended in place, so a long
+                # chain like a|b|c|... is flattened in linear time
+                children = self._children(left, op)
+                children.extend(self._children(right, op))
+                stack.append((op, children))
+
+            elif char == '&':
+                right = self._finish(stack.pop())
+                left = self._finish(stack.pop())
+                stack.append(self._intern(("&", (left, right))))
+
+            elif char in {'*', '+', '?'}:
+                stack.append(self._intern((char, self._finish(stack.pop()))))
+
+            else:
+                raise ValueError("Complement '~' is not supported by Thompson's construction.")
+
+        if len(stack) != 1:
+            raise ValueError("Invalid postfix expression: stack does not contain exactly one NFA at the end.")
+
+        return self._finish(stack.pop())
+
+    def _children_of(self, expr_id: int) -> tuple:
+        op, arg = self._keys[expr_id]
+        if op == "sym":
+            return ()
+        if op in ("cat", "alt", "&"):
+            return arg
+        return (arg,)
+
+    def _build(self, expr_id: int) -> Fragment:
+        """Build one fragment; every child fragment is already cached."""
+        op, arg = self._keys[expr_id]
+        fragments = self._fragments
+
+        if op == "sym":
+            return symbol_fragment(arg)
+        if op == "cat":
+            return concat_fragment([fragments[i] for i in arg])
+        if op == "alt":
+            return union_fragment([fragments[i] for i in arg])
+        if op == "&":
+            return intersect_fragment(fragments[arg[0]], fragments[arg[1]])
+        return repeat_fragment(fragments[arg], op)
+
+    def fragment(self, expr_id: int) -> Fragment:
+        """
+        Return the fragment for an interned expression, building it (and
+        any missing sub-expression) if needed. The expression is walked
+        children first with an explicit stack, so deep nesting is fine.
+        """
+        stack = [(expr_id, False)]
+
+        while stack:
+            current, children_done = stack.pop()
+            if children_done:
+                self.misses += 1
+                self._fragments[current] = self._build(current)
+                continue
+
+            if current in self._fragments:
+                self.hits += 1
+                continue
+
+            stack.append((current, True))
+            for child in reversed(self._children_of(current)):
+                stack.append((child, False))
+
+        return self._fragments[expr_id]
+
+    def compile(self, postfix_regex: str) -> NFA:
+        """Postfix regex -> NFA, reusing every cached sub-expression."""
+        return fragment_to_nfa(self.fragment(self.parse(postfix_regex)))
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expressions": len(self._keys),
+            "fragments": len(self._fragments),
+        }
+
+    def clear(self):
+        self._ids.clear()
+        self._keys.clear()
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
@@ -2,6 +2,8 @@
 
 from collections import deque
 
+from src.nfa_structure import EPSILON
+
 class DFAState:
     """Represents a DFA state, which is a set of NFA states."""
     def __init__(self, nfa_states):
@@ -20,8 +22,8 @@ def epsilon_closure(states):
 
     while stack:
         state = stack.pop()
-        if '' in state.transitions:
-            for nxt in state.transitions['']:
+        if EPSILON in state.transitions:
+            for nxt in state.transitions[EPSILON]:
                 if nxt not in closure:
                     closure.add(nxt)
                     stack.append(nxt)
@@ -66,7 +68,7 @@ def nfa_to_dfa(nfa):
     alphabet = set()
     for s in collect_all_states(nfa.start_state):
         for symbol in s.transitions:
-            if symbol != '':
+            if symbol != EPSILON:
                 alphabet.add(symbol)
 
     while queue:
@@ -87,3 +89,16 @@ def nfa_to_dfa(nfa):
             dfa_state.transitions[symbol] = dfa_states[frozen]
 
     return start_dfa, dfa_states
+
+
+def dfa_accepts(start_dfa, text):
+    """
+    Run a DFA (from nfa_to_dfa or any engine with the same state interface)
+    over `text`. A missing transition means the input is rejected.
+    """
+    state = start_dfa
+    for symbol in text:
+        state = state.transitions.get(symbol)
+        if state is None:
+            return False
+    return state.is_accept
@@ -0,0 +1,383 @@
+# src/nfa_reduction.py
+
+"""
+NFA reduction pass, run between postfix_to_nfa and determinization.
+
+Thompson NFAs are full of epsilon chains and of states that behave the
+same way. reduce_nfa() returns a smaller NFA for the same language:
+
+    1. epsilon removal   every state gets the symbol moves of its
+                         epsilon-closure, and accepts if its closure does
+    2. pruning           states that are unreachable from the start, or
+                         that can never reach an accepting state, go away
+    3. merging           forward-bisimilar states (same future) and
+                         backward-bisimilar states (same past) are merged,
+                         using Paige-Tarjan partition refinement, until
+                         nothing changes
+
+The result has no epsilon transitions and may have several accepting
+states, so `accept_state` is only set when exactly one is left; the other
+engines only look at `start_state` and `is_accepting`.
+"""
+
+import itertools
+
+from src.nfa_structure import State, NFA, EPSILON
+
+
+def _index_states(nfa: NFA):
+    """Number the reachable states by creation order."""
+    seen = set()
+    stack = [nfa.start_state]
+    while stack:
+        state = stack.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        for targets in state.transitions.values():
+            stack.extend(targets)
+    return sorted(seen, key=lambda s: s.id)
+
+
+def _size(transitions) -> dict:
+    return {
+        "states": len(transitions),
+        "transitions": sum(len(ts) for row in transitions for ts in row.values()),
+    }
+
+
+def epsilon_closures(eps, important, roots):
+    """
+    Return state -> frozenset of the `important` states in its
+    epsilon-closure, for every state epsilon-reachable from `roots`.
+
+    Closures are computed once per strongly connected component of the
+    epsilon graph (Tarjan's algorithm, iterative), successors first, so
+    each component only unions the closures of the components it points
+    to. A component with no important state of its own and a single
+    successor closure reuses that frozenset instead of copying it, which
+    keeps long epsilon chains (the ends of nested unions) linear.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    component = []
+    closure = {}
+    nothing = frozenset()
+
+    for root in roots:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        component.append(root)
+        on_stack.add(root)
+        work = [(root, 0)]
+
+        while work:
+            v, i = work[-1]
+            if i < len(eps[v]):
+                work[-1] = (v, i + 1)
+                w = eps[v][i]
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    component.append(w)
+                    on_stack.add(w)
+                    work.append((w, 0))
+                elif w in on_stack:
+                    low[v] = min(low[v], index[w])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] != index[v]:
+                continue
+
+            # v is the root of a component: pop it, its successors are done
+            members = []
+            while True:
+                w = component.pop()
+                on_stack.discard(w)
+                members.append(w)
+                if w == v:
+                    break
+            inside = set(members)
+
+            own = [w for w in members if important[w]]
+            parts = {}
+            for w in members:
+                for x in eps[w]:
+                    if x not in inside:
+                        parts[id(closure[x])] = closure[x]
+
+            if not own and len(parts) <= 1:
+                result = next(iter(parts.values()), nothing)
+            else:
+                result = frozenset(own).union(*parts.values())
+            for w in members:
+                closure[w] = result
+
+    return closure
+
+
+def _remove_epsilon(eps, moves, accepting, start):
+    """
+    Step 1: fold each state's epsilon-closure into the state itself.
+
+    Once epsilon moves are gone, only the start state and the targets of
+    symbol moves can still be reached, so only their closures are
+    computed; every other state is left without moves (and is dropped by
+    _prune). Only states that read a symbol or accept matter inside a
+    closure.
+    """
+    n = len(moves)
+    important = [bool(moves[i]) or accepting[i] for i in range(n)]
+
+    needed = {start}
+    for row in moves:
+        for targets in row.values():
+            needed.update(targets)
+    closures = epsilon_closures(eps, important, sorted(needed))
+
+    new_moves = [{} for _ in range(n)]
+    new_accepting = [False] * n
+    for i in needed:
+        row = new_moves[i]
+        for j in closures[i]:
+            for sym, targets in moves[j].items():
+                row.setdefault(sym, set()).update(targets)
+        new_accepting[i] = any(accepting[j] for j in closures[i])
+
+    return new_moves, new_accepting
+
+
+def _prune(moves, accepting, start):
+    """Step 2: keep only states that are reachable and can still accept."""
+    n = len(moves)
+    incoming = [set() for _ in range(n)]
+    for i, row in enumerate(moves):
+        for targets in row.values():
+            for j in targets:
+                incoming[j].add(i)
+
+    reachable = {start}
+    stack = [start]
+    while stack:
+        for targets in moves[stack.pop()].values():
+            for j in targets:
+                if j not in reachable:
+                    reachable.add(j)
+                    stack.append(j)
+
+    alive = {i for i in reachable if accepting[i]}
+    stack = list(alive)
+    while stack:
+        for j in incoming[stack.pop()]:
+            if j in reachable and j not in alive:
+                alive.add(j)
+                stack.append(j)
+
+    if start not in alive:
+        return [{}], [False], 0
+
+    keep = sorted(alive)
+    number = {old: new for new, old in enumerate(keep)}
+    new_moves = [
+        {sym: {number[j] for j in targets if j in alive} for sym, targets in moves[i].items()}
+        for i in keep
+    ]
+    new_moves = [{sym: ts for sym, ts in row.items() if ts} for row in new_moves]
+    return new_moves, [accepting[i] for i in keep], number[start]
+
+
+def _refine(edges, initial):
+    """
+    Partition refinement: start from the `initial` block of every state and
+    split blocks until all states of a block have the same set of
+    (symbol, block of neighbour) pairs. `edges[i]` lists (symbol, neighbour).
+
+    Paige-Tarjan: blocks are grouped into compound blocks, and the
+    partition is always stable with respect to every compound block. Each
+    round takes a block B holding at most half of its compound S and, per
+    symbol, splits the blocks of B's predecessors twice: by "has an edge
+    into B" and by "all its edges into S go into B" (per-state edge counts
+    make the second test O(1)). Only predecessors of B are touched, and a
+    state can only be in such a B log(n) times, so the whole refinement is
+    O(m log n) instead of one pass over every edge per split.
+    """
+    n = len(edges)
+    inverse = [[] for _ in range(n)]
+    count = {}      # (state, symbol, compound) -> edges from state into compound
+    for i, neighbours in enumerate(edges):
+        for sym, j in neighbours:
+            inverse[j].append((sym, i))
+            count[i, sym, 0] = count.get((i, sym, 0), 0) + 1
+
+    numbers = {}
+    block = [numbers.setdefault(b, len(numbers)) for b in initial]
+    members = [set() for _ in numbers]
+    for i, b in enumerate(block):
+        members[b].add(i)
+    compound = [0] * len(members)       # block -> compound block
+    parts = [set(range(len(members)))]  # compound block -> blocks
+    pending = [0] if len(members) > 1 else []
+
+    def split(marked):
+        """Move the marked states of every block they touch into a new block."""
+        moved = {}
+        for x in marked:
+            b = block[x]
+            new = moved.get(b)
+            if new is None:
+                new = moved[b] = len(members)
+                members.append(set())
+                compound.append(compound[b])
+            members[b].discard(x)
+            members[new].add(x)
+            block[x] = new
+        for b, new in moved.items():
+            if not members[b]:
+                # The whole block was marked: it did not split after all
+                members[b], members[new] = members[new], members[b]
+                for x in members[b]:
+                    block[x] = b
+                continue
+            c = compound[b]
+            parts[c].add(new)
+            if len(parts[c]) == 2:
+                pending.append(c)
+
+    # Stable with respect to the single compound block: same symbols out
+    sources = {}
+    for i, neighbours in enumerate(edges):
+        for sym, _ in neighbours:
+            sources.setdefault(sym, set()).add(i)
+    for sym in sorted(sources):
+        split(sources[sym])
+
+    while pending:
+        c = pending.pop()
+        first, second = list(itertools.islice(parts[c], 2))
+        b = first if len(members[first]) <= len(members[second]) else second
+        parts[c].discard(b)
+        if len(parts[c]) > 1:
+            pending.append(c)
+        splitter = len(parts)
+        parts.append({b})
+        compound[b] = splitter
+
+        into = {}       # symbol -> state -> edges from state into B
+        for y in members[b]:
+            for sym, x in inverse[y]:
+                row = into.setdefault(sym, {})
+                row[x] = row.get(x, 0) + 1
+
+        for sym, row in into.items():
+            split(row)
+            split([x for x, k in row.items() if k == count[x, sym, c]])
+            for x, k in row.items():
+                count[x, sym, splitter] = k
+                rest = count[x, sym, c] - k
+                if rest:
+                    count[x, sym, c] = rest
+                else:
+                    del count[x, sym, c]
+
+    # Number the blocks by first state, like a single pass would
+    numbers = {}
+    block = [numbers.setdefault(b, len(numbers)) for b in block]
+    return block, len(numbers)
+
+
+def _quotient(moves, accepting, start, block, count):
+    """Merge the states of each block into one state."""
+    new_moves = [{} for _ in range(count)]
+    new_accepting = [False] * count
+    for i, row in enumerate(moves):
+        b = block[i]
+        new_accepting[b] = new_accepting[b] or accepting[i]
+        for sym, targets in row.items():
+            new_moves[b].setdefault(sym, set()).update(block[j] for j in targets)
+    return new_moves, new_accepting, block[start]
+
+
+def _merge_bisimilar(moves, accepting, start):
+    """Step 3: alternate forward and backward bisimulation until stable."""
+    while True:
+        n = len(moves)
+
+        # Forward: same accepting flag, same moves into the same blocks
+        outgoing = [[(sym, j) for sym, ts in row.items() for j in ts] for row in moves]
+        block, count = _refine(outgoing, [int(a) for a in accepting])
+        moves, accepting, start = _quotient(moves, accepting, start, block, count)
+
+        # Backward: the start state is kept apart, then same incoming moves
+        incoming = [[] for _ in range(count)]
+        for i, row in enumerate(moves):
+            for sym, targets in row.items():
+                for j in targets:
+                    incoming[j].append((sym, i))
+        block, count = _refine(incoming, [int(i == start) for i in range(count)])
+        moves, accepting, start = _quotient(moves, accepting, start, block, count)
+
+        if count == n:
+            return moves, accepting, start
+
+
+def reduce_nfa(nfa: NFA):
+    """
+    Return (reduced NFA, report). The input NFA is left untouched.
+
+    The report gives the number of states and transitions before the
+    pass and after each step, e.g.
+        {"input": {"states": 8, "transitions": 9, "epsilon": 7},
+         "epsilon_removed": {...}, "pruned": {...}, "merged": {...}}
+    """
+    states = _index_states(nfa)
+    if any(s.tag is not None for s in states):
+        raise ValueError("Capture tags live on epsilon paths; reduce NFAs without capturing groups only.")
+
+    index = {s: i for i, s in enumerate(states)}
+    eps = [[index[t] for t in s.transitions.get(EPSILON, ())] for s in states]
+    moves = [
+        {sym: {index[t] for t in targets} for sym, targets in s.transitions.items() if sym != EPSILON}
+        for s in states
+    ]
+    accepting = [s.is_accepting for s in states]
+    start = index[nfa.start_state]
+
+    report = {"input": _size(moves)}
+    report["input"]["transitions"] += sum(len(e) for e in eps)
+    report["input"]["epsilon"] = sum(len(e) for e in eps)
+
+    moves, accepting = _remove_epsilon(eps, moves, accepting, start)
+    report["epsilon_removed"] = _size(moves)
+
+    moves, accepting, start = _prune(moves, accepting, start)
+    report["pruned"] = _size(moves)
+
+    moves, accepting, start = _merge_bisimilar(moves, accepting, start)
+    report["merged"] = _size(moves)
+
+    # Rebuild as State objects, start state first
+    new_states = [State(is_accepting=a) for a in accepting]
+    for i, row in enumerate(moves):
+        for sym in sorted(row):
+            for j in sorted(row[sym]):
+                new_states[i].add_transition(sym, new_states[j])
+
+    accept_states = [s for s in new_states if s.is_accepting]
+    accept = accept_states[0] if len(accept_states) == 1 else None
+    return NFA(new_states[start], accept), report
+
+
+def format_report(report: dict) -> str:
+    """One-line summary of a reduce_nfa report."""
+    before = report["input"]
+    after = report["merged"]
+    return (
+        f"{before['states']} -> {after['states']} states, "
+        f"{before['transitions']} -> {after['transitions']} transitions "
+        f"({before['epsilon']} epsilon removed)"
+    )
@@ -1,5 +1,8 @@
 # franck
 
+# Label of epsilon transitions, shared by every module that builds or reads NFAs
+EPSILON = "eps"
+
 class State:
     """
     Represents one state in an NFA.
@@ -15,6 +18,10 @@ class State:
         # key   -> symbol (str)
         # value -> set of next State objects
         self.transitions = {}
+
+        # tag -> capture slot (int) recorded when a match passes through
+        #        this state, or None. Only set by capturing groups.
+        self.tag = None
         
     def add_transition(self, symbol: str, next_state: 'State'):
         """
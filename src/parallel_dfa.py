@@ -0,0 +1,169 @@
+# src/parallel_dfa.py
+
+"""
+Parallel subset construction.
+
+nfa_to_dfa explores one DFA state at a time. Here the NFA is first
+flattened into integer tables, and the subset construction runs level by
+level: the whole frontier of unexplored subsets is split into batches,
+a process pool computes move + epsilon-closure for every (subset, symbol)
+pair of each batch, and the coordinator de-duplicates the new subsets and
+builds the next frontier.
+
+Subsets are frozensets of NFA state indices: cheap to send between
+processes, unioned in C and canonical as dict keys. Epsilon-closures are
+only computed for the states a subset can start from (the start state
+and the targets of symbol moves), once per strongly connected component
+of the epsilon graph (nfa_reduction.epsilon_closures). The result has
+exactly the same states and transitions as nfa_to_dfa.
+"""
+
+import multiprocessing
+
+from src.nfa_structure import NFA, EPSILON
+from src.nfa_dfa import DFAState, collect_all_states
+from src.nfa_reduction import epsilon_closures
+
+# Tables of the NFA being determinized, set once per worker process
+_tables = None
+
+
+class NFATables:
+    """
+    Integer form of an NFA:
+
+    states   -> the original State objects, by index (sorted by id)
+    alphabet -> sorted list of the non-epsilon symbols
+    moves    -> per state index with symbol moves, a dict: symbol ->
+                frozenset of the epsilon-closure of its targets
+    start    -> frozenset of the epsilon-closure of the start state
+    """
+
+    def __init__(self, nfa: NFA):
+        self.states = sorted(collect_all_states(nfa.start_state), key=lambda s: s.id)
+        index = {s: i for i, s in enumerate(self.states)}
+        eps = [[index[t] for t in s.transitions.get(EPSILON, ())] for s in self.states]
+
+        # Only the start state and symbol targets ever begin a closure
+        start = index[nfa.start_state]
+        targets = {
+            index[t]
+            for s in self.states
+            for symbol, ts in s.transitions.items() if symbol != EPSILON
+            for t in ts
+        }
+        closures = epsilon_closures(eps, [True] * len(self.states), [start] + sorted(targets))
+
+        self.alphabet = sorted({
+            symbol for s in self.states for symbol in s.transitions if symbol != EPSILON
+        })
+        self.moves = {}
+        for i, state in enumerate(self.states):
+            for symbol, ts in state.transitions.items():
+                if symbol == EPSILON:
+                    continue
+                if len(ts) == 1:
+                    # Shared with every other state of the same closure
+                    closure = closures[index[next(iter(ts))]]
+                else:
+                    closure = frozenset().union(*(closures[index[t]] for t in ts))
+                self.moves.setdefault(i, {})[symbol] = closure
+
+        self.start = closures[start]
+
+    def states_of(self, subset: frozenset) -> set:
+        """Subset of indices -> set of State objects."""
+        return {self.states[i] for i in subset}
+
+
+def _expand(tables: NFATables, subset: frozenset) -> dict:
+    """Return symbol -> target subset (non-empty only) for one DFA state."""
+    targets = {}
+    for i in subset:
+        row = tables.moves.get(i)
+        if row:
+            for symbol, closure in row.items():
+                target = targets.get(symbol)
+                if target is None:
+                    targets[symbol] = set(closure)
+                else:
+                    target |= closure
+    return {symbol: frozenset(targets[symbol]) for symbol in sorted(targets)}
+
+
+def _init_worker(tables):
+    global _tables
+    # Workers only need the integer tables, not the State objects
+    _tables = tables
+
+
+def _expand_batch(batch):
+    return [_expand(_tables, subset) for subset in batch]
+
+
+def _worker_tables(tables: NFATables) -> NFATables:
+    """A copy of the tables without the State objects, for pickling."""
+    light = NFATables.__new__(NFATables)
+    light.states = None
+    light.alphabet = tables.alphabet
+    light.moves = tables.moves
+    light.start = tables.start
+    return light
+
+
+def parallel_nfa_to_dfa(nfa: NFA, processes: int = None, batch_size: int = 256, min_parallel: int = 64):
+    """
+    Convert an NFA into a DFA using a process pool.
+    Returns the start DFA state and a dict of all DFA states, exactly
+    like nfa_to_dfa.
+
+    processes    -> pool size (default: number of CPUs)
+    batch_size   -> subsets sent to a worker in one task
+    min_parallel -> frontiers smaller than this are expanded in-process,
+                    where shipping them would cost more than the work
+    """
+    tables = NFATables(nfa)
+    transitions = {}            # subset -> {symbol: subset}
+    frontier = [tables.start]
+    seen = {tables.start}
+    pool = None
+
+    try:
+        while frontier:
+            if len(frontier) < min_parallel:
+                expanded = [_expand(tables, subset) for subset in frontier]
+            else:
+                if pool is None:
+                    pool = multiprocessing.Pool(
+                        processes, initializer=_init_worker, initargs=(_worker_tables(tables),)
+                    )
+                batches = [frontier[i:i + batch_size] for i in range(0, len(frontier), batch_size)]
+                expanded = [row for rows in pool.map(_expand_batch, batches) for row in rows]
+
+            next_frontier = []
+            for subset, row in zip(frontier, expanded):
+                transitions[subset] = row
+                for target in row.values():
+                    if target not in seen:
+                        seen.add(target)
+                        next_frontier.append(target)
+            frontier = next_frontier
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    # Build the same DFAState objects as nfa_to_dfa
+    dfa_by_subset = {}
+    dfa_states = {}
+    for subset in transitions:
+        nfa_states = tables.states_of(subset)
+        dfa_state = DFAState(nfa_states)
+        dfa_by_subset[subset] = dfa_state
+        dfa_states[dfa_state.nfa_states] = dfa_state
+
+    for subset, row in transitions.items():
+        dfa_state = dfa_by_subset[subset]
+        for symbol, target in row.items():
+            dfa_state.transitions[symbol] = dfa_by_subset[target]
+
+    return dfa_by_subset[tables.start], dfa_states
@@ -1,19 +1,11 @@
 # diane
-<<<<<<< HEAD
 
 def add_concatenation(regex):
     """Insert '.' between implicit concatenations (alternative to queen)."""
-=======
-def add_concatenation(regex):
-    """
-    Example: a.b|c -> ab.c|
-    """
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
     result = ""
     for i in range(len(regex)):
         c1 = regex[i]
 
-<<<<<<< HEAD
         if i < len(regex) - 1:
             c2 = regex[i + 1]
             result += c1
@@ -21,54 +13,38 @@ def add_concatenation(regex):
             if (
                 (c1.isalnum() or c1 in ")*+?")
                 and
-                (c2.isalnum() or c2 == '(')
+                (c2.isalnum() or c2 in "(~")
             ):
                 result += "."
-=======
-        if i + 1 < len(regex):
-            c2 = regex[i + 1]
-
-            result += c1
-
-            # Conditions where concatenation is needed
-            if (
-                (c1.isalnum() or c1 in ")*+?") and
-                (c2.isalnum() or c2 == '(')
-            ):
-                result += '.'
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
         else:
             result += c1
 
     return result
 
 
-def regex_shunting_yard(regex):
-<<<<<<< HEAD
-    """Convert regex (with explicit concatenation) to postfix using shunting yard."""
+def regex_shunting_yard(regex, capture=False):
+    """
+    Convert regex (with explicit concatenation) to postfix using shunting yard.
+
+    With capture=True every parenthesized group is closed by a ')' in the
+    postfix output, so postfix_to_nfa can record where the group matched.
+    """
 
-=======
-    # Precedence rules for regex
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
     precedence = {
         '*': 3,
         '+': 3,
         '?': 3,
-<<<<<<< HEAD
+        '~': 2.5,  # Complement (prefix): binds looser than *, tighter than .
         '.': 2,
         '&': 1,
         '|': 1
-=======
-        '.': 2,   # Concatenation
-        '|': 1    # OR
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
     }
 
     output = []
     stack = []
+    previous = None
 
     for token in regex:
-<<<<<<< HEAD
 
         if token.isalnum():
             output.append(token)
@@ -77,9 +53,17 @@ def regex_shunting_yard(regex):
             stack.append(token)
 
         elif token == ")":
+            if capture and previous == "(":
+                raise ValueError("Empty group '()': a capturing group needs an operand.")
             while stack and stack[-1] != "(":
                 output.append(stack.pop())
             stack.pop()   # remove '('
+            if capture:
+                output.append(")")
+
+        elif token == "~":
+            # Prefix operator: it has no left operand yet, so nothing is popped
+            stack.append(token)
 
         else:  # operator
             while (
@@ -90,42 +74,9 @@ def regex_shunting_yard(regex):
                 output.append(stack.pop())
             stack.append(token)
 
-=======
-        # Operand (a, b, c, 1, 2, etc.)
-        if token.isalnum():
-            output.append(token)
-
-        # Left parenthesis
-        elif token == '(':
-            stack.append(token)
-
-        # Right parenthesis
-        elif token == ')':
-            while stack and stack[-1] != '(':
-                output.append(stack.pop())
-            stack.pop()  # Remove '('
-
-        # Operator
-        else:
-            while stack and stack[-1] != '(' and precedence.get(stack[-1], 0) >= precedence.get(token, 0):
-                output.append(stack.pop())
-            stack.append(token)
+        previous = token
 
-    # Pop remaining operators
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
     while stack:
         output.append(stack.pop())
 
     return "".join(output)
-<<<<<<< HEAD
-=======
-
-
-regex = input("Enter a REGEX: ")
-
-formatted_regex = add_concatenation(regex)
-postfix = regex_shunting_yard(formatted_regex)
-
-print("With explicit concatenation:", formatted_regex)
-print("Postfix (RPN):", postfix)
->>>>>>> 0ffa5b5a5805dd4d7d2142caaf24fde1d59a034e
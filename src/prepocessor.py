@@ -6,27 +6,27 @@ def insert_concatenation_operator(regex: str) -> str:
     concatenation should occur.
     """
 
-    allowed_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789()*+?|.")
+    operators = set("()*+?|.&~")
 
-    # Validate characters
+    # Validate characters: symbols are letters and digits, including
+    # non-ASCII ones (é, ü, ж, ...), the same test the parser uses
     for char in regex:
-        if char not in allowed_chars:
+        if not (char.isalnum() or char in operators):
             raise ValueError(f"Invalid character detected: '{char}'")
 
     # Invalid start characters
-    if regex[0] in "*?|)":
-        raise ValueError("Regex cannot start with '*', '?', '|', or ')'.")
+    if regex[0] in "*?|)&":
+        raise ValueError("Regex cannot start with '*', '?', '|', '&', or ')'.")
 
     # Invalid ending characters
-    if regex[-1] in "|(":
-        raise ValueError("Regex cannot end with '|' or '('.")
+    if regex[-1] in "|(&~":
+        raise ValueError("Regex cannot end with '|', '&', '~', or '('.")
 
     # Edge case: too short
     if len(regex) < 2:
         return regex
 
     result = ""
-    symbols = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
 
     for i in range(len(regex) - 1):
         c1 = regex[i]
@@ -36,9 +36,9 @@ def insert_concatenation_operator(regex: str) -> str:
 
         # Check for concatenation
         if (
-            (c1 in symbols or c1 in ")*+?")
+            (c1.isalnum() or c1 in ")*+?")
             and
-            (c2 in symbols or c2 == '(')
+            (c2.isalnum() or c2 in "(~")
         ):
             result += "."
 
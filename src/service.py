@@ -0,0 +1,263 @@
+# src/service.py
+
+"""
+Long-running compile/match service.
+
+Keeps compiled automata warm in memory and answers JSON-lines requests,
+either on a Unix socket or on stdin/stdout. One request per line, one
+response per line; every response echoes the request's "id".
+
+    {"id": 1, "op": "compile", "regex": "(a|b)*abb"}
+    {"id": 2, "op": "match", "regex": "(a|b)*abb", "text": "aabb"}
+    {"id": 3, "op": "stats"}
+    {"id": 4, "op": "render", "regex": "a|b", "output": "nfa_graph"}
+
+Builds (regex -> minimized DFA table -> compiled matcher code) run in a
+process pool, so a large compile never blocks matches against automata
+that are already warm. Graphviz is only imported when a render is
+requested, and renders only write plain file names inside the service's
+output directory.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+from src.factoring import factor_alternations
+from src.dfa_table import postfix_to_table
+from src.codegen import compile_code, load_code
+
+
+def build_table(regex: str):
+    """Raw regex -> minimized DFATable. Runs inside a pool worker."""
+    if not regex:
+        raise ValueError("Empty regular expression provided.")
+    postfix = factor_alternations(regex_shunting_yard(insert_concatenation_operator(regex)))
+    return postfix_to_table(postfix)
+
+
+def build_matcher(regex: str):
+    """Raw regex -> (DFATable, compile_code result). Runs inside a pool worker."""
+    table = build_table(regex)
+    return table, compile_code(table)
+
+
+def render_nfa(regex: str, output_filename: str):
+    """Build the Thompson NFA of a regex and draw it (imports graphviz)."""
+    from src.converter import postfix_to_nfa
+    from src.display import display_nfa
+
+    postfix = regex_shunting_yard(insert_concatenation_operator(regex))
+    display_nfa(postfix_to_nfa(postfix), output_filename)
+
+
+class MatcherService:
+    """
+    Request handler shared by the socket and stdio front ends.
+
+    compiled -> LRU of regex -> (DFATable, match function)
+    pending  -> regex -> Future of a build in progress, so concurrent
+                requests for the same regex share one build
+    """
+
+    def __init__(self, workers: int = None, max_automata: int = 1024, output_dir: str = "."):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.max_automata = max_automata
+        self.output_dir = os.path.abspath(output_dir)
+        self.compiled = OrderedDict()
+        self.pending = {}
+        self.started = time.time()
+        self.counters = {"requests": 0, "errors": 0, "builds": 0, "hits": 0}
+
+    async def get_matcher(self, regex: str):
+        entry = self.compiled.get(regex)
+        if entry is not None:
+            self.counters["hits"] += 1
+            self.compiled.move_to_end(regex)
+            return entry
+
+        if regex not in self.pending:
+            loop = asyncio.get_running_loop()
+            self.pending[regex] = loop.run_in_executor(self.executor, build_matcher, regex)
+            self.counters["builds"] += 1
+        try:
+            table, code = await self.pending[regex]
+        finally:
+            self.pending.pop(regex, None)
+
+        entry = self.compiled.get(regex)
+        if entry is None:
+            entry = (table, load_code(code))
+            self.compiled[regex] = entry
+            if len(self.compiled) > self.max_automata:
+                self.compiled.popitem(last=False)
+        return entry
+
+    def output_path(self, output) -> str:
+        """Path of a render output inside output_dir; only plain file names are accepted."""
+        if not isinstance(output, str) or output in ("", ".", "..") or "\0" in output:
+            raise ValueError(f"Invalid output name: {output!r}")
+        if os.sep in output or (os.altsep and os.altsep in output):
+            raise ValueError(f"Output must be a file name, not a path: {output!r}")
+        return os.path.join(self.output_dir, output)
+
+    async def handle(self, request: dict) -> dict:
+        """Answer one decoded request."""
+        self.counters["requests"] += 1
+        response = {"id": request.get("id")}
+        op = request.get("op")
+
+        try:
+            if op == "compile":
+                table, _ = await self.get_matcher(request["regex"])
+                response.update(ok=True, states=len(table), symbols="".join(table.symbols))
+
+            elif op == "match":
+                _, match = await self.get_matcher(request["regex"])
+                response.update(ok=True, match=match(request["text"]))
+
+            elif op == "stats":
+                response.update(
+                    ok=True,
+                    automata=len(self.compiled),
+                    building=len(self.pending),
+                    uptime=round(time.time() - self.started, 3),
+                    **self.counters,
+                )
+
+            elif op == "render":
+                loop = asyncio.get_running_loop()
+                output = request.get("output", "nfa_graph")
+                path = self.output_path(output)
+                # graphviz calls an external program: keep it off the event loop
+                await loop.run_in_executor(None, render_nfa, request["regex"], path)
+                response.update(ok=True, output=output)
+
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+
+        except Exception as e:
+            self.counters["errors"] += 1
+            response.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+        return response
+
+    async def handle_line(self, line: bytes) -> bytes:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            self.counters["errors"] += 1
+            return (json.dumps({"id": None, "ok": False, "error": f"Bad request: {e}"}) + "\n").encode()
+        response = await self.handle(request)
+        return (json.dumps(response) + "\n").encode()
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def _serve_stream(service, reader, write):
+    """Read requests line by line and answer each one as soon as it is ready."""
+    tasks = set()
+
+    async def answer(line):
+        write(await service.handle_line(line))
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        task = asyncio.create_task(answer(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+def _is_same_file(path: str, expected: os.stat_result) -> bool:
+    try:
+        current = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    return (current.st_dev, current.st_ino) == (expected.st_dev, expected.st_ino)
+
+
+async def serve_unix(socket_path: str, workers: int = None, output_dir: str = "."):
+    """
+    Serve requests on a Unix socket until cancelled. A stale socket left at
+    `socket_path` by an earlier run is replaced; any other file there is
+    an error. On shutdown only the socket this server created is removed.
+    """
+    if os.path.lexists(socket_path):
+        if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+            raise FileExistsError(f"{socket_path} exists and is not a socket; refusing to replace it.")
+        os.unlink(socket_path)
+
+    service = MatcherService(workers, output_dir=output_dir)
+
+    async def on_client(reader, writer):
+        try:
+            await _serve_stream(service, reader, writer.write)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    try:
+        server = await asyncio.start_unix_server(on_client, path=socket_path)
+    except BaseException:
+        service.shutdown()
+        raise
+    created = os.lstat(socket_path)
+    print(f"[ok] Listening on {socket_path}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+        if _is_same_file(socket_path, created):
+            os.unlink(socket_path)
+
+
+
+async def serve_stdio(workers: int = None, output_dir: str = "."):
+    """Serve requests from stdin, answering on stdout, until stdin closes."""
+    service = MatcherService(workers, output_dir=output_dir)
+    loop = asyncio.get_running_loop()
+
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    def write(data: bytes):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    try:
+        await _serve_stream(service, reader, write)
+    finally:
+        service.shutdown()
+
+
+def serve(socket_path: str = "-", workers: int = None, output_dir: str = "."):
+    """Entry point: socket_path '-' means stdin/stdout. Renders go to output_dir."""
+    try:
+        if socket_path == "-":
+            asyncio.run(serve_stdio(workers, output_dir))
+        else:
+            asyncio.run(serve_unix(socket_path, workers, output_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else "-")
@@ -0,0 +1,242 @@
+# src/shared_tables.py
+
+"""
+Shared-memory DFA tables for multiprocessing workers.
+
+Sending a DFA to pool workers normally pickles the whole DFAState object
+graph once per worker. Here a DFATable is instead written once into a
+multiprocessing.shared_memory block, and workers attach to it by name
+and match directly on the shared buffer, without copying it.
+
+Block layout (all integers are native int32):
+
+    header       4 ints: MAGIC, number of states, number of symbols, 0
+    symbols      one code point per symbol (column order)
+    transitions  states x symbols ints, row-major; -1 = no transition
+    accept       bitmap, one bit per state (bit s % 8 of byte s // 8)
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory, util
+
+from src.dfa_table import DFATable
+
+MAGIC = 0x44464131     # "DFA1"
+_HEADER_INTS = 4
+_INT_SIZE = 4
+
+
+def _block_size(n_states: int, n_symbols: int) -> int:
+    ints = _HEADER_INTS + n_symbols + n_states * n_symbols
+    return ints * _INT_SIZE + (n_states + 7) // 8
+
+
+class SharedTable:
+    """
+    A DFA table living in a shared memory block.
+
+    Create one with `SharedTable.publish(table)` in the parent process and
+    open it in workers with `SharedTable.attach(name)`. Every process must
+    call close() when done; only the publisher calls unlink().
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+
+        ints = shm.buf[: (shm.size // _INT_SIZE) * _INT_SIZE].cast("i")
+        if ints[0] != MAGIC:
+            ints.release()
+            raise ValueError(f"Shared memory block '{shm.name}' does not hold a DFA table.")
+
+        self.n_states = ints[1]
+        self.n_symbols = ints[2]
+        symbols_end = _HEADER_INTS + self.n_symbols
+        table_end = symbols_end + self.n_states * self.n_symbols
+
+        # Zero-copy views into the block
+        self._ints = ints
+        self.transitions = ints[symbols_end:table_end]
+        self.accept = shm.buf[table_end * _INT_SIZE: table_end * _INT_SIZE + (self.n_states + 7) // 8]
+
+        # The symbol -> column map is tiny, so each process keeps a dict
+        self.columns = {chr(ints[_HEADER_INTS + i]): i for i in range(self.n_symbols)}
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def publish(cls, table: DFATable, name: str = None) -> "SharedTable":
+        """Copy a DFATable into a new shared memory block."""
+        n_states = len(table)
+        n_symbols = len(table.symbols)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_block_size(n_states, n_symbols))
+
+        ints = shm.buf[: (shm.size // _INT_SIZE) * _INT_SIZE].cast("i")
+        ints[0] = MAGIC
+        ints[1] = n_states
+        ints[2] = n_symbols
+        ints[3] = 0
+
+        columns = {}
+        for i, symbol in enumerate(table.symbols):
+            ints[_HEADER_INTS + i] = ord(symbol)
+            columns[symbol] = i
+
+        base = _HEADER_INTS + n_symbols
+        for state, row in enumerate(table.transitions):
+            offset = base + state * n_symbols
+            for i in range(n_symbols):
+                ints[offset + i] = -1
+            for symbol, target in row.items():
+                ints[offset + columns[symbol]] = target
+
+        accept_start = (base + n_states * n_symbols) * _INT_SIZE
+        bitmap = bytearray((n_states + 7) // 8)
+        for state, accepting in enumerate(table.accepting):
+            if accepting:
+                bitmap[state // 8] |= 1 << (state % 8)
+        shm.buf[accept_start: accept_start + len(bitmap)] = bitmap
+        ints.release()
+
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTable":
+        """Open a table published by another process."""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def is_accepting(self, state: int) -> bool:
+        return bool(self.accept[state // 8] & (1 << (state % 8)))
+
+    def matches(self, text) -> bool:
+        """Run the DFA over `text`, reading transitions from shared memory."""
+        transitions = self.transitions
+        columns = self.columns
+        n_symbols = self.n_symbols
+        state = 0
+        for symbol in text:
+            column = columns.get(symbol)
+            if column is None:
+                return False
+            state = transitions[state * n_symbols + column]
+            if state < 0:
+                return False
+        return self.is_accepting(state)
+
+    def to_table(self) -> DFATable:
+        """Copy the shared table back into a regular DFATable."""
+        symbols = sorted(self.columns, key=self.columns.get)
+        transitions = []
+        for state in range(self.n_states):
+            row = {}
+            for symbol, column in self.columns.items():
+                target = self.transitions[state * self.n_symbols + column]
+                if target >= 0:
+                    row[symbol] = target
+            transitions.append(dict(sorted(row.items())))
+        accepting = [self.is_accepting(s) for s in range(self.n_states)]
+        return DFATable(symbols, transitions, accepting)
+
+    def close(self):
+        """Release this process's views and mapping of the block (call unlink() first)."""
+        if self.shm is None:
+            return
+        # Exported memoryviews must be released before the mapping can close
+        self.transitions.release()
+        self.accept.release()
+        self._ints.release()
+        self.shm.close()
+        self.shm = None
+
+    def unlink(self):
+        """Destroy the block. Only the publisher should call this."""
+        if not self.owner:
+            raise RuntimeError("Only the process that published a table may unlink it.")
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.owner:
+            self.unlink()
+        self.close()
+
+
+# ------------------------------------------------------------------
+# Pool helper
+# ------------------------------------------------------------------
+
+# Tables attached by the current worker process: name -> SharedTable
+_worker_tables = {}
+
+
+def _close_worker_tables():
+    for shared in _worker_tables.values():
+        shared.close()
+    _worker_tables.clear()
+
+
+def _attach_worker(names):
+    # Close the views when the worker exits. Otherwise, with the spawn
+    # start method, SharedMemory.__del__ runs while they are still
+    # exported and prints a BufferError for every worker.
+    util.Finalize(None, _close_worker_tables, exitpriority=10)
+    for name in names:
+        _worker_tables[name] = SharedTable.attach(name)
+
+
+def _match_in_worker(args):
+    name, text = args
+    return _worker_tables[name].matches(text)
+
+
+class SharedMatcherPool:
+    """
+    A multiprocessing pool whose workers match against shared DFA tables.
+
+    The tables are published when the pool starts, every worker attaches
+    to all of them once (pool initializer), and everything is closed and
+    unlinked when the pool is closed:
+
+        with SharedMatcherPool({"ids": table}, processes=4) as pool:
+            results = pool.match("ids", lines)
+    """
+
+    def __init__(self, tables: dict, processes: int = None):
+        self.tables = {}
+        try:
+            for key, table in tables.items():
+                self.tables[key] = SharedTable.publish(table)
+            names = [shared.name for shared in self.tables.values()]
+            self.pool = multiprocessing.Pool(processes, initializer=_attach_worker, initargs=(names,))
+        except Exception:
+            self._release_tables()
+            raise
+
+    def match(self, key, texts, chunksize: int = 64) -> list:
+        """Match every text against table `key`; returns a list of bools."""
+        name = self.tables[key].name
+        return self.pool.map(_match_in_worker, ((name, text) for text in texts), chunksize)
+
+    def _release_tables(self):
+        for shared in self.tables.values():
+            shared.unlink()
+            shared.close()
+        self.tables = {}
+
+    def close(self):
+        # Workers go first, so no one is still reading a block when it is unlinked
+        self.pool.close()
+        self.pool.join()
+        self._release_tables()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            self.pool.terminate()
+        self.close()
@@ -0,0 +1,94 @@
+# tests/test_byte_dfa.py
+
+import itertools
+import mmap
+import re
+
+import pytest
+from src.byte_dfa import ByteDFA, utf8_table
+from src.dfa_table import dfa_to_table, minimize_table, table_accepts
+from src.derivatives import regex_to_dfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def char_table(postfix):
+    return minimize_table(dfa_to_table(regex_to_dfa(postfix)[0]))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def test_ascii_table_keeps_its_shape():
+    table = char_table("ab|*c.")
+    byte_table = utf8_table(table)
+
+    assert len(byte_table) == len(table)
+    assert byte_table.symbols == [ord("a"), ord("b"), ord("c")]
+
+
+@pytest.mark.parametrize("postfix", ["éa|*ü.", "日本.語|", "a😀|+", "é~"])
+def test_unicode_agrees_with_character_dfa(postfix):
+    table = char_table(postfix)
+    matcher = ByteDFA(utf8_table(table))
+
+    for text in all_strings("aéü日本語😀", 3):
+        assert matcher.matches(text.encode("utf-8")) == table_accepts(table, text), text
+
+
+def test_shared_lead_bytes_share_states():
+    # é (C3 A9) and ü (C3 BC) share their first byte
+    byte_table = utf8_table(char_table("éü|"))
+
+    # start --C3--> middle --A9/BC--> accept
+    assert len(byte_table) == 3
+
+
+def test_shared_suffixes_are_merged():
+    # à (C3 A0) and Ġ (C4 A0) end with the same byte into the same target
+    byte_table = utf8_table(char_table("àĠ|"))
+
+    assert len(byte_table) == 3
+
+
+def test_invalid_utf8_is_rejected():
+    matcher = ByteDFA.from_postfix("é")
+
+    assert matcher.matches("é".encode("utf-8"))
+    assert not matcher.matches(b"\xc3")
+    assert not matcher.matches(b"\xc3\xc3")
+    assert not matcher.matches("é".encode("latin-1"))
+
+
+def test_buffers_without_decoding(tmp_path):
+    matcher = ByteDFA.from_postfix("ab|*c.")
+    data = b"ab" * 100_000 + b"c"
+
+    assert matcher.matches(data)
+    assert matcher.matches(bytearray(data))
+    assert matcher.matches(memoryview(data))
+    assert not matcher.matches(data[:-1])
+
+    path = tmp_path / "log.bin"
+    path.write_bytes(data)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert matcher.matches(mm)
+
+
+def test_dead_state_stops_early():
+    matcher = ByteDFA.from_postfix("a*")
+
+    assert not matcher.matches(b"b" + b"a" * 200_000)
+
+
+def test_raw_unicode_regex_to_bytes():
+    regex = "(é|ü)+ж?"
+    postfix = regex_shunting_yard(insert_concatenation_operator(regex))
+    matcher = ByteDFA.from_postfix(postfix)
+
+    for text in ["é", "üéü", "éж", "üж", ""]:
+        assert matcher.matches(text.encode("utf-8")) == (re.fullmatch(regex, text) is not None), text
+    assert not matcher.matches("e".encode("utf-8"))
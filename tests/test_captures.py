@@ -0,0 +1,71 @@
+# tests/test_captures.py
+
+import itertools
+import re
+
+import pytest
+from src.captures import compile_captures
+from src.converter import postfix_to_nfa, number_groups
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def re_spans(regex, text):
+    m = re.fullmatch(regex, text)
+    if m is None:
+        return None
+    return [m.span(k) if m.span(k) != (-1, -1) else None for k in range(1, m.re.groups + 1)]
+
+
+@pytest.mark.parametrize("regex", [
+    "(a|b)*c",
+    "(a*)(a*)",
+    "(ab|a)(b*)",
+    "((a)b)*",
+    "(a)?(b)?",
+    "a(b(c)?)+",
+    "(a|ab)(c|bcd)?",
+])
+def test_spans_agree_with_re(regex):
+    matcher = compile_captures(regex)
+
+    for text in all_strings("abcd", 5):
+        assert matcher.fullmatch(text) == re_spans(regex, text), text
+
+
+def test_groups_are_numbered_by_opening_parenthesis():
+    # ((a)b): the outer group closes last but is group 1
+    assert number_groups("a)b.)") == [1, 0]
+    assert compile_captures("((a)b)").fullmatch("ab") == [(0, 2), (0, 1)]
+
+
+def test_plain_postfix_has_no_tags():
+    nfa = postfix_to_nfa("ab|*c.")
+    matcher = compile_captures("(a|b)*c")
+
+    assert matcher.group_count == 1
+    assert nfa.start_state.tag is None
+
+
+def test_no_exponential_blowup():
+    # Classic catastrophic-backtracking shape: (a*)*b against a^n
+    matcher = compile_captures("(a*)*b")
+
+    assert matcher.fullmatch("a" * 2000) is None
+    assert matcher.fullmatch("a" * 2000 + "b") is not None
+
+
+def test_nullable_loop_body_is_not_repeated_empty():
+    # Unlike re, no extra empty iteration of '+' is taken (see captures.py)
+    assert compile_captures("((a)*)+").fullmatch("a") == [(0, 1), (0, 1)]
+    assert re_spans("((a)*)+", "a") == [(1, 1), (0, 1)]
+
+
+@pytest.mark.parametrize("regex", ["a()", "()", "(a)()*"])
+def test_empty_group_is_rejected(regex):
+    with pytest.raises(ValueError):
+        compile_captures(regex)
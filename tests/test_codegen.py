@@ -0,0 +1,112 @@
+# tests/test_codegen.py
+
+import itertools
+import os
+import re
+
+import pytest
+from src import codegen
+from src.codegen import compile_regex, compile_table, generate_source
+from src.dfa_table import dfa_to_table, minimize_table, table_key
+from src.derivatives import regex_to_dfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def table_for(regex):
+    return minimize_table(dfa_to_table(regex_to_dfa(to_postfix(regex))[0]))
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a+b?c*", "(ab|ba)*", "abc"])
+def test_generated_matcher_agrees_with_re(regex):
+    match = compile_regex(to_postfix(regex))
+
+    for n in range(6):
+        for chars in itertools.product("abc", repeat=n):
+            text = "".join(chars)
+            assert match(text) == (re.fullmatch(regex, text) is not None), text
+
+
+def test_rejects_unknown_symbols():
+    match = compile_regex(to_postfix("ab"))
+
+    assert match("ab")
+    assert not match("az")
+    assert not match("abz")
+
+
+def test_complement_matcher():
+    match = compile_regex(to_postfix("~(ab)"))
+
+    assert match("")
+    assert match("ba")
+    assert not match("ab")
+
+
+def test_source_is_cached_on_disk(tmp_path):
+    codegen.clear_cache()
+    table = table_for("(a|b)*c")
+
+    match = compile_table(table, cache_dir=str(tmp_path))
+    path = tmp_path / f"{table_key(table)}.py"
+
+    assert path.exists()
+    assert path.read_text() == generate_source(table, table_key(table))
+    assert match("abac")
+
+    # A fresh process-level cache loads the file instead of regenerating it
+    codegen.clear_cache()
+    path.write_text(path.read_text().replace("# Generated", "# Loaded from disk; generated"))
+    assert compile_table(table, cache_dir=str(tmp_path))("abac")
+    assert os.listdir(tmp_path) == [path.name]
+    assert path.read_text().startswith("# Loaded from disk")
+
+
+def test_cached_file_for_another_table_is_regenerated(tmp_path):
+    codegen.clear_cache()
+    table = table_for("(a|b)*c")
+    other = table_for("x")
+    path = tmp_path / f"{table_key(table)}.py"
+
+    # A file under this table's name, but generated for another table
+    path.write_text(generate_source(other, table_key(other)))
+    match = compile_table(table, cache_dir=str(tmp_path))
+
+    assert match("abac")
+    assert not match("x")
+    assert path.read_text() == generate_source(table, table_key(table))
+
+
+def test_in_process_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(codegen, "MAX_COMPILED", 2)
+    codegen.clear_cache()
+
+    first = compile_table(table_for("a"))
+    compile_table(table_for("b"))
+    assert compile_table(table_for("a")) is first     # hit, now most recent
+    compile_table(table_for("c"))                      # evicts "b"
+
+    assert len(codegen._compiled) == 2
+    assert table_key(table_for("b")) not in codegen._compiled
+    assert compile_table(table_for("a")) is first
+
+
+def test_warm_regex_cache_skips_the_build(tmp_path, monkeypatch):
+    codegen.clear_cache()
+    postfix = to_postfix("(a|b)*abb")
+    compile_regex(postfix, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == [f"{codegen.regex_key(postfix)}.py"]
+
+    def no_build(postfix_regex):
+        raise AssertionError("the DFA should not be rebuilt")
+
+    monkeypatch.setattr(codegen, "postfix_to_table", no_build)
+    codegen.clear_cache()
+    match = compile_regex(postfix, cache_dir=str(tmp_path))
+
+    assert match("aabb")
+    assert not match("abab")
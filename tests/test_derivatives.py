@@ -0,0 +1,142 @@
+# tests/test_derivatives.py
+
+import gc
+import itertools
+import re
+
+import pytest
+from src.derivatives import (
+    postfix_to_regex, regex_to_dfa, matches, symbol, union, intersect,
+    concat, star, complement, empty, epsilon, Regex,
+)
+from src.nfa_dfa import dfa_accepts
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def test_nodes_are_hash_consed():
+    r1 = postfix_to_regex("ab|*c.")
+    r2 = postfix_to_regex("ba|*c.")
+
+    # Union is commutative, so both spellings give the same node
+    assert r1 is r2
+
+
+def test_smart_constructor_identities():
+    a = symbol("a")
+
+    assert union(a, a) is a
+    assert union(a, empty()) is a
+    assert concat(a, epsilon()) is a
+    assert concat(empty(), a) is empty()
+    assert star(star(a)) is star(a)
+    assert complement(complement(a)) is a
+    assert intersect(a, empty()) is empty()
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*c", "ab*a", "a+b?", "(ab|ba)*", "a(b|c)*a?"])
+def test_dfa_agrees_with_re(regex):
+    start, _ = regex_to_dfa(to_postfix(regex))
+
+    for text in all_strings("abc", 5):
+        expected = re.fullmatch(regex, text) is not None
+        assert dfa_accepts(start, text) == expected, text
+
+
+def test_intersection():
+    # strings of a/b that contain an 'a' and end with 'b'
+    start, _ = regex_to_dfa(to_postfix("((a|b)*a(a|b)*)&((a|b)*b)"))
+
+    for text in all_strings("ab", 5):
+        assert dfa_accepts(start, text) == ("a" in text and text.endswith("b")), text
+
+
+def test_complement():
+    # every a/b string that is not exactly "ab"
+    start, _ = regex_to_dfa(to_postfix("~(ab)"))
+
+    for text in all_strings("ab", 4):
+        assert dfa_accepts(start, text) == (text != "ab"), text
+
+
+def test_complement_and_intersection_together():
+    # a/b strings that do not contain "aa"
+    postfix = to_postfix("(a|b)*&~((a|b)*aa(a|b)*)")
+    start, states = regex_to_dfa(postfix)
+
+    for text in all_strings("ab", 6):
+        assert dfa_accepts(start, text) == ("aa" not in text), text
+        assert matches(postfix, text) == ("aa" not in text), text
+
+    # A small number of canonical states, no product blow-up
+    assert len(states) <= 4
+
+
+def test_complement_is_relative_to_alphabet():
+    start, _ = regex_to_dfa(to_postfix("~a"), alphabet="ab")
+
+    assert dfa_accepts(start, "b")
+    assert dfa_accepts(start, "")
+    assert not dfa_accepts(start, "a")
+    assert not dfa_accepts(start, "c")
+
+
+def test_matches_uses_the_same_alphabet_as_the_dfa():
+    postfix = to_postfix("~(ab)")
+    start, _ = regex_to_dfa(postfix)
+
+    for text in ["c", "ac", "", "ba", "ab"]:
+        assert matches(postfix, text) == dfa_accepts(start, text), text
+    assert not matches(postfix, "c")
+    assert matches(postfix, "c", alphabet="abc")
+
+
+def test_long_literal():
+    text = "ab" * 1500
+    postfix = to_postfix(text)
+    start, states = regex_to_dfa(postfix)
+
+    assert len(states) == len(text) + 1
+    assert dfa_accepts(start, text)
+    assert not dfa_accepts(start, text[:-1])
+    assert matches(postfix, text)
+    assert not matches(postfix, text + "a")
+
+
+def test_long_run_of_nullable_heads():
+    # a?a?...a?b: deriving by "b" walks every nullable head
+    n = 1100
+    postfix = "a?" + "a?." * (n - 1) + "b."
+    start, states = regex_to_dfa(postfix)
+
+    assert len(states) == n + 2
+    assert dfa_accepts(start, "a" * n + "b")
+    assert not dfa_accepts(start, "a" * (n + 1) + "b")
+    assert matches(postfix, "a" * 3 + "b")
+
+
+def test_unused_nodes_are_freed():
+    gc.collect()
+    before = len(Regex._table)
+
+    start, states = regex_to_dfa(to_postfix("(x|y)*xyy(xy|yx)*z"))
+    assert len(Regex._table) > before
+
+    del start, states
+    gc.collect()
+    assert len(Regex._table) == before
+
+
+def test_invalid_postfix():
+    with pytest.raises(ValueError):
+        postfix_to_regex("ab")
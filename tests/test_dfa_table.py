@@ -0,0 +1,78 @@
+# tests/test_dfa_table.py
+
+import itertools
+import re
+
+import pytest
+from src.dfa_table import dfa_to_table, minimize_table, postfix_to_table, table_accepts, table_key
+from src.derivatives import regex_to_dfa
+from src.nfa_dfa import nfa_to_dfa
+from src.nfa_structure import State, NFA, EPSILON
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def test_table_from_subset_construction():
+    # a, then an epsilon move to the accepting state
+    s1 = State()
+    s2 = State()
+    s3 = State(is_accepting=True)
+    s1.add_transition("a", s2)
+    s2.add_transition(EPSILON, s3)
+    start, _ = nfa_to_dfa(NFA(s1, s3))
+
+    table = dfa_to_table(start)
+
+    assert table.symbols == ["a"]
+    assert table.transitions == [{"a": 1}, {}]
+    assert table.accepting == [False, True]
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a*|b*", "(ab|ba)*a?", "a(b|c)*"])
+def test_minimized_table_keeps_language(regex):
+    start, _ = regex_to_dfa(to_postfix(regex))
+    table = dfa_to_table(start)
+    minimal = minimize_table(table)
+
+    assert len(minimal) <= len(table)
+    for text in all_strings("abc", 5):
+        expected = re.fullmatch(regex, text) is not None
+        assert table_accepts(minimal, text) == expected, text
+
+
+def test_minimal_table_is_canonical():
+    # Two spellings of the same language give the same minimal table
+    t1 = minimize_table(dfa_to_table(regex_to_dfa(to_postfix("(a|b)*"))[0]))
+    t2 = minimize_table(dfa_to_table(regex_to_dfa(to_postfix("(a*b*)*"))[0]))
+
+    assert len(t1) == 1
+    assert table_key(t1) == table_key(t2)
+
+
+def test_states_that_cannot_accept_are_dropped():
+    # a&b is empty: the start state can never reach acceptance
+    table = minimize_table(dfa_to_table(regex_to_dfa(to_postfix("(ab)&(ba)"))[0]))
+
+    assert len(table) == 1
+    assert table.transitions == [{}]
+    assert not table_accepts(table, "ab")
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "(ab|ba)*", "(a|b)*&(b|a)(a|b)", "~(ab)", "a*&~(a*aa)"])
+def test_postfix_to_table_matches_derivative_engine(regex):
+    postfix = to_postfix(regex)
+    table = postfix_to_table(postfix)
+    expected = minimize_table(dfa_to_table(regex_to_dfa(postfix)[0]))
+
+    # Both paths give the same minimal DFA
+    assert table_key(table) == table_key(expected)
@@ -0,0 +1,72 @@
+# tests/test_differential.py
+
+import random
+
+from benchmarks.differential import (
+    fuzz, benchmark, measure, check_regressions, random_tree, tree_to_regex,
+    sample_match, re_may_explode, THRESHOLDS,
+)
+
+
+def test_every_engine_agrees_with_re():
+    report = fuzz(seed=1, count=30, depth=3, inputs_per_case=5)
+
+    assert report["mismatches"] == []
+    assert report["inputs"] > report["cases"]
+
+
+def test_empty_engine_list_runs_no_engine():
+    # `--engines re` leaves nothing to compare against re
+    assert fuzz(seed=1, count=2, depth=2, inputs_per_case=2, engines=[])["mismatches_by_engine"] == {}
+    assert benchmark(size=100, engines=[], patterns=["(a|b)*abb"]) == {"(a|b)*abb": {}}
+
+    only = fuzz(seed=1, count=2, depth=2, inputs_per_case=2, engines=["table"])
+    assert list(only["mismatches_by_engine"]) == ["table"]
+
+
+def test_samples_belong_to_the_language():
+    import re
+    rng = random.Random(3)
+    for _ in range(50):
+        node = random_tree(rng, 4)
+        if re_may_explode(node):
+            continue
+        regex = tree_to_regex(node)
+        assert re.fullmatch(regex, sample_match(node, rng)), regex
+
+
+def test_loops_over_empty_matches_are_kept_away_from_re():
+    assert re_may_explode(("*", ("?", ("sym", "a"))))
+    assert not re_may_explode(("*", ("sym", "a")))
+
+
+def test_measure_reports_all_metrics():
+    result = measure("codegen", "(a|b)*abb", "ab" * 1000 + "abb", repeat=1)
+
+    assert set(result) == {"compile_ms", "memory_kb", "throughput_mb_s"}
+    assert result["throughput_mb_s"] > 0
+
+
+def test_regression_check():
+    perf = {"(a|b)*": {"table": {"compile_ms": 10.0, "memory_kb": 1.0, "throughput_mb_s": 20.0}}}
+    baseline = {"performance": perf}
+    clean = {"correctness": {"mismatches": []}, "performance": perf}
+    slower = {
+        "correctness": {"mismatches": []},
+        "performance": {"(a|b)*": {"table": {"compile_ms": 20.0, "memory_kb": 1.0, "throughput_mb_s": 10.0}}},
+    }
+
+    assert check_regressions(clean, baseline, THRESHOLDS) == []
+    failures = check_regressions(slower, baseline, THRESHOLDS)
+    assert len(failures) == 2
+
+
+def test_mismatches_always_fail():
+    report = {
+        "correctness": {"mismatches": [
+            {"engine": "table", "regex": "a", "text": "b", "expected": False, "got": True}
+        ]},
+        "performance": {},
+    }
+
+    assert len(check_regressions(report, None)) == 1
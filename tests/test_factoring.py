@@ -0,0 +1,84 @@
+# tests/test_factoring.py
+
+import itertools
+
+import pytest
+from src.factoring import factor_alternations
+from src.converter import postfix_to_nfa
+from src.derivatives import matches
+from src.nfa_dfa import collect_all_states, nfa_to_dfa, dfa_accepts
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def test_common_prefix_is_factored():
+    assert factor_alternations(to_postfix("abc|abd")) == to_postfix("ab(c|d)")
+
+
+def test_common_tail_is_shared():
+    assert factor_alternations(to_postfix("cat|bat")) == to_postfix("(c|b)at")
+
+
+def test_word_that_is_prefix_of_another():
+    assert factor_alternations(to_postfix("ab|abc")) == to_postfix("abc?")
+
+
+@pytest.mark.parametrize("regex", [
+    "abc|abd|b",
+    "ab|a|abb",
+    "(ab|ac)*c",
+    "a*b|a*c|a",
+    "ab|ba|aab|bba",
+    "(a|b)&(ab|aa|b)",
+])
+def test_language_is_unchanged(regex):
+    original = to_postfix(regex)
+    factored = factor_alternations(original)
+
+    for text in all_strings("abc", 4):
+        assert matches(factored, text) == matches(original, text), text
+
+
+def test_nfa_shrinks_for_word_lists():
+    words = ["pre" + "".join(w) for w in itertools.product("abc", repeat=4)]
+    postfix = to_postfix("|".join(words))
+
+    before = len(collect_all_states(postfix_to_nfa(postfix).start_state))
+    after = len(collect_all_states(postfix_to_nfa(factor_alternations(postfix)).start_state))
+
+    assert after < before / 3
+
+
+def test_long_branches():
+    long_a = "ab" * 700
+    long_b = "ab" * 699 + "ba"
+    postfix = to_postfix(f"{long_a}|{long_b}|c")
+    factored = factor_alternations(postfix)
+
+    assert factored == to_postfix(f"{'ab' * 699}(ab|ba)|c")
+    start, _ = nfa_to_dfa(postfix_to_nfa(factored))
+    assert dfa_accepts(start, long_a)
+    assert dfa_accepts(start, long_b)
+    assert not dfa_accepts(start, long_a + "b")
+
+
+def test_deep_nesting():
+    regex = "a"
+    for _ in range(600):
+        regex = f"({regex}|b)c"
+    factored = factor_alternations(to_postfix(regex))
+
+    start, _ = nfa_to_dfa(postfix_to_nfa(factored))
+    assert dfa_accepts(start, "a" + "c" * 600)
+    assert dfa_accepts(start, "b" + "c" * 600)
+    assert not dfa_accepts(start, "ac")
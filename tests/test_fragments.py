@@ -0,0 +1,125 @@
+# tests/test_fragments.py
+
+import itertools
+
+import pytest
+from src.fragments import FragmentCache
+from src.converter import postfix_to_nfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def nfa_accepts(nfa, text):
+    """Small NFA simulator for 'eps'-labelled NFAs."""
+    def closure(states):
+        stack = list(states)
+        result = set(states)
+        while stack:
+            for nxt in stack.pop().transitions.get("eps", ()):
+                if nxt not in result:
+                    result.add(nxt)
+                    stack.append(nxt)
+        return result
+
+    current = closure({nfa.start_state})
+    for char in text:
+        current = closure({t for s in current for t in s.transitions.get(char, ())})
+    return any(s.is_accepting for s in current)
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+@pytest.mark.parametrize("postfix", ["a", "ab.", "ab|", "a*", "a+b.", "a?b.", "ab|*c.", "ab.ba.|*"])
+def test_same_language_as_converter(postfix):
+    cache = FragmentCache()
+    expected = postfix_to_nfa(postfix)
+    actual = cache.compile(postfix)
+
+    for text in all_strings("abc", 5):
+        assert nfa_accepts(actual, text) == nfa_accepts(expected, text), text
+
+
+def test_intersection():
+    # (a|b)*a  &  a(a|b)*  -> starts and ends with 'a'
+    nfa = FragmentCache().compile("ab|*a.aab|*.&")
+
+    for text in all_strings("ab", 5):
+        expected = text.startswith("a") and text.endswith("a")
+        assert nfa_accepts(nfa, text) == expected, text
+
+
+def test_equivalent_spellings_share_one_fragment():
+    cache = FragmentCache()
+
+    # a|b|c and c|(b|a) normalize to the same union
+    assert cache.parse("ab|c|") == cache.parse("cba||")
+    # (ab)c and a(bc) normalize to the same concatenation
+    assert cache.parse("ab.c.") == cache.parse("abc..")
+
+
+def test_editing_one_alternative_rebuilds_only_that_branch():
+    cache = FragmentCache()
+    words = ["alpha", "beta", "gamma", "delta"]
+
+    def postfix_for(words):
+        parts = [w[0] + "".join(c + "." for c in w[1:]) for w in words]
+        return parts[0] + "".join(p + "|" for p in parts[1:])
+
+    cache.compile(postfix_for(words))
+    before = cache.stats()
+
+    cache.compile(postfix_for(words[:3] + ["omega"]))
+    after = cache.stats()
+
+    # New nodes: the symbol o, the "omega" concatenation and the union
+    assert after["misses"] - before["misses"] == 3
+    # The other three words come straight from the cache
+    assert after["hits"] - before["hits"] >= 3
+
+
+def test_fragments_are_not_mutated_between_compiles():
+    cache = FragmentCache()
+    first = cache.compile("ab.")
+    second = cache.compile("ab.")
+
+    assert first.start_state is not second.start_state
+    assert nfa_accepts(first, "ab") and nfa_accepts(second, "ab")
+
+
+def test_complement_is_rejected():
+    with pytest.raises(ValueError):
+        FragmentCache().compile("a~")
+
+
+def nested(depth):
+    regex = "a"
+    for _ in range(depth):
+        regex = f"({regex}|b)c"
+    return regex
+
+
+def test_deep_nesting_builds_without_recursion():
+    regex = nested(1000)
+    nfa = FragmentCache().compile(to_postfix(regex))
+
+    assert nfa_accepts(nfa, "a" + "c" * 1000)
+    assert nfa_accepts(nfa, "b" + "c" * 1000)
+    assert not nfa_accepts(nfa, "a" + "c" * 999)
+
+
+def test_fragments_share_children_instead_of_copying():
+    cache = FragmentCache()
+    cache.compile(to_postfix(nested(200)))
+
+    # Each fragment stores only its own glue edges and references to its
+    # children, so the cache grows linearly with the pattern
+    stored = sum(len(f.edges) + len(f.parts) for f in cache._fragments.values())
+    assert stored < 10 * 200
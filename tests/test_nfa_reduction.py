@@ -0,0 +1,121 @@
+# tests/test_nfa_reduction.py
+
+import itertools
+import random
+import re
+import time
+
+import pytest
+from src.nfa_reduction import reduce_nfa, format_report
+from src.converter import postfix_to_nfa
+from src.nfa_dfa import nfa_to_dfa, dfa_accepts, collect_all_states
+from src.nfa_structure import EPSILON
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a+b?c*", "(ab|ba)*", "(a|b)*(a|b)", "abc|abd"])
+def test_thompson_nfa_now_determinizes_correctly(regex):
+    # converter.py and nfa_dfa.py share the EPSILON label
+    start, _ = nfa_to_dfa(postfix_to_nfa(to_postfix(regex)))
+
+    for text in all_strings("abc", 5):
+        assert dfa_accepts(start, text) == (re.fullmatch(regex, text) is not None), text
+
+
+@pytest.mark.parametrize("regex", [
+    "(a|b)*abb", "a+b?c*", "(ab|ba)*", "((a|b)&(b|c))*", "a*|b*",
+    # epsilon cycles: several states share one strongly connected component
+    "((a?)*|b)*c", "(a*b*)*", "((a|b?)+)*c?",
+])
+def test_reduced_nfa_keeps_language(regex):
+    nfa = postfix_to_nfa(to_postfix(regex))
+    reduced, _ = reduce_nfa(nfa)
+
+    original_dfa, _ = nfa_to_dfa(nfa)
+    reduced_dfa, _ = nfa_to_dfa(reduced)
+    for text in all_strings("abc", 5):
+        assert dfa_accepts(reduced_dfa, text) == dfa_accepts(original_dfa, text), text
+
+
+def test_reduced_nfa_has_no_epsilon_and_is_smaller():
+    nfa = postfix_to_nfa(to_postfix("(a|b)*abb"))
+    reduced, report = reduce_nfa(nfa)
+
+    states = collect_all_states(reduced.start_state)
+    assert all(EPSILON not in s.transitions for s in states)
+    assert report["input"]["states"] == len(collect_all_states(nfa.start_state))
+    assert report["merged"]["states"] == len(states) <= 4
+    assert "epsilon removed" in format_report(report)
+
+
+def test_bisimilar_branches_are_merged():
+    # Both branches of a|a are the same machine
+    reduced, _ = reduce_nfa(postfix_to_nfa("aa|"))
+
+    assert len(collect_all_states(reduced.start_state)) == 2
+    assert reduced.accept_state is not None
+
+
+def test_empty_language():
+    # Intersection of disjoint languages: nothing can accept
+    reduced, report = reduce_nfa(postfix_to_nfa("ab&"))
+
+    assert report["merged"]["states"] == 1
+    assert not reduced.start_state.is_accepting
+    assert reduced.start_state.transitions == {}
+
+
+def test_input_is_not_modified():
+    nfa = postfix_to_nfa("ab.")
+    before = len(collect_all_states(nfa.start_state))
+    reduce_nfa(nfa)
+
+    assert len(collect_all_states(nfa.start_state)) == before
+    assert nfa.accept_state.is_accepting
+
+
+def test_capture_tags_are_rejected():
+    with pytest.raises(ValueError):
+        reduce_nfa(postfix_to_nfa("a)"))
+
+
+def test_large_word_union():
+    words = ["".join(w) for w in itertools.product("abcd", repeat=5)]
+    nfa = postfix_to_nfa(to_postfix("|".join(words)))
+    reduced, report = reduce_nfa(nfa)
+
+    assert report["input"]["states"] > 10000
+    # One state per trie node: 1 + 4 + 16 + 64 + 256 prefixes, merged suffixes
+    assert report["merged"]["states"] <= 341
+    start, _ = nfa_to_dfa(reduced)
+    for word in words[::37]:
+        assert dfa_accepts(start, word)
+        assert not dfa_accepts(start, word[:-1])
+
+
+def test_long_literal_is_reduced_quickly():
+    # Every split of a chain peels off one state: naive refinement was
+    # quadratic here (~100 s for 6000 symbols)
+    rng = random.Random(2)
+    literal = "".join(rng.choice("abc") for _ in range(6000))
+    nfa = postfix_to_nfa(literal[0] + "".join(c + "." for c in literal[1:]))
+
+    began = time.perf_counter()
+    reduced, report = reduce_nfa(nfa)
+    assert time.perf_counter() - began < 10
+
+    assert report["merged"]["states"] == len(literal) + 1
+    start, _ = nfa_to_dfa(reduced)
+    assert dfa_accepts(start, literal)
+    assert not dfa_accepts(start, literal[:-1])
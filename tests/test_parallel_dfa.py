@@ -0,0 +1,70 @@
+# tests/test_parallel_dfa.py
+
+import random
+
+import pytest
+from src.parallel_dfa import parallel_nfa_to_dfa, NFATables
+from src.converter import postfix_to_nfa
+from src.nfa_dfa import nfa_to_dfa
+from src.nfa_reduction import reduce_nfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def to_postfix(regex):
+    return regex_shunting_yard(insert_concatenation_operator(regex))
+
+
+def describe(dfa_states):
+    """DFA as {nfa state ids: (accept, {symbol: target nfa state ids})}."""
+    def ids(state):
+        return frozenset(s.id for s in state.nfa_states)
+    return {
+        ids(st): (st.is_accept, {sym: ids(t) for sym, t in st.transitions.items()})
+        for st in dfa_states.values()
+    }
+
+
+@pytest.mark.parametrize("regex", ["(a|b)*abb", "a+b?c*", "(ab|ba)*", "(a|b)*a(a|b)(a|b)(a|b)"])
+def test_identical_to_serial_in_process(regex):
+    nfa = postfix_to_nfa(to_postfix(regex))
+    serial_start, serial = nfa_to_dfa(nfa)
+    start, parallel = parallel_nfa_to_dfa(nfa, min_parallel=10**9)
+
+    assert describe(parallel) == describe(serial)
+    assert start.nfa_states == serial_start.nfa_states
+
+
+def test_identical_to_serial_with_pool():
+    # Large enough frontiers to go through the pool (the DFA has 2^8 + 1 states)
+    nfa = postfix_to_nfa(to_postfix("(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)"))
+    _, serial = nfa_to_dfa(nfa)
+    _, parallel = parallel_nfa_to_dfa(nfa, processes=2, batch_size=8, min_parallel=4)
+
+    assert len(parallel) == len(serial) > 256
+    assert describe(parallel) == describe(serial)
+
+
+def test_works_on_reduced_nfa():
+    reduced, _ = reduce_nfa(postfix_to_nfa(to_postfix("(a|b)*abb")))
+
+    assert describe(parallel_nfa_to_dfa(reduced)[1]) == describe(nfa_to_dfa(reduced)[1])
+
+
+def test_tables_use_epsilon_closures():
+    tables = NFATables(postfix_to_nfa("a*"))
+
+    # The start closure already contains the accepting state
+    assert any(s.is_accepting for s in tables.states_of(tables.start))
+    assert tables.alphabet == ["a"]
+
+
+def test_large_word_union():
+    # Long epsilon chains at the ends of the union: closures must be shared
+    rng = random.Random(5)
+    words = ["".join(rng.choice("abcdefgh") for _ in range(6)) for _ in range(800)]
+    nfa = postfix_to_nfa(to_postfix("|".join(words)))
+    _, serial = nfa_to_dfa(nfa)
+    _, parallel = parallel_nfa_to_dfa(nfa, processes=2, min_parallel=100)
+
+    assert describe(parallel) == describe(serial)
@@ -0,0 +1,157 @@
+# tests/test_service.py
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from src.service import MatcherService, serve_unix
+from src.client import ServiceClient
+
+
+def run_requests(requests):
+    async def go():
+        service = MatcherService(workers=1)
+        try:
+            return await asyncio.gather(*(service.handle(r) for r in requests))
+        finally:
+            service.shutdown()
+    return asyncio.run(go())
+
+
+def test_compile_match_and_stats():
+    responses = run_requests([
+        {"id": 1, "op": "match", "regex": "(a|b)*abb", "text": "babb"},
+        {"id": 2, "op": "match", "regex": "(a|b)*abb", "text": "bab"},
+        {"id": 3, "op": "compile", "regex": "ab|ac"},
+    ])
+
+    assert responses[0] == {"id": 1, "ok": True, "match": True}
+    assert responses[1] == {"id": 2, "ok": True, "match": False}
+    assert responses[2]["ok"] and responses[2]["symbols"] == "abc"
+
+
+def test_concurrent_requests_share_one_build():
+    async def go():
+        service = MatcherService(workers=1)
+        try:
+            await asyncio.gather(*(
+                service.handle({"op": "match", "regex": "(ab)*", "text": "ab" * i})
+                for i in range(10)
+            ))
+            return await service.handle({"op": "stats"})
+        finally:
+            service.shutdown()
+
+    stats = asyncio.run(go())
+    assert stats["builds"] == 1
+    assert stats["automata"] == 1
+
+
+def test_errors_are_reported_not_raised():
+    responses = run_requests([
+        {"id": 1, "op": "explode"},
+        {"id": 2, "op": "match", "regex": "", "text": "a"},
+    ])
+
+    assert all(r["ok"] is False for r in responses)
+    assert "Unknown op" in responses[0]["error"]
+
+
+def test_stdio_mode():
+    requests = [
+        {"id": 1, "op": "match", "regex": "a+b", "text": "aab"},
+        {"id": 2, "op": "match", "regex": "a+b", "text": "b"},
+    ]
+    stdin = "".join(json.dumps(r) + "\n" for r in requests) + "not json\n"
+
+    result = subprocess.run(
+        [sys.executable, "main.py", "--serve", "-"],
+        input=stdin, capture_output=True, text=True, timeout=60,
+    )
+    responses = {r["id"]: r for r in map(json.loads, result.stdout.splitlines())}
+
+    assert responses[1]["match"] is True
+    assert responses[2]["match"] is False
+    assert responses[None]["ok"] is False
+
+
+def test_unix_socket_with_client(tmp_path):
+    socket_path = str(tmp_path / "nfa.sock")
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve_unix(socket_path, workers=1))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    try:
+        for _ in range(200):
+            if (tmp_path / "nfa.sock").exists():
+                break
+            time.sleep(0.01)
+
+        with ServiceClient(socket_path) as client:
+            assert client.match("(a|b)*c", "abac")
+            assert not client.match("(a|b)*c", "abca")
+            assert client.stats()["builds"] == 1
+            with pytest.raises(RuntimeError):
+                client.request("nope")
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        time.sleep(0.1)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+
+def test_unix_socket_refuses_to_replace_other_files(tmp_path):
+    victim = tmp_path / "victim.txt"
+    victim.write_text("keep me")
+
+    with pytest.raises(FileExistsError):
+        asyncio.run(serve_unix(str(victim), workers=1))
+    assert victim.read_text() == "keep me"
+
+
+def test_shutdown_leaves_a_replaced_socket_path_alone(tmp_path):
+    socket_path = tmp_path / "nfa.sock"
+
+    async def run():
+        task = asyncio.create_task(serve_unix(str(socket_path), workers=1))
+        while not socket_path.exists():
+            await asyncio.sleep(0.01)
+        # Someone else takes over the path while the server runs
+        socket_path.unlink()
+        socket_path.write_text("not ours")
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert socket_path.read_text() == "not ours"
+
+
+def test_render_rejects_paths(tmp_path):
+    async def go():
+        service = MatcherService(workers=1, output_dir=str(tmp_path))
+        try:
+            return await asyncio.gather(*(
+                service.handle({"id": i, "op": "render", "regex": "a|b", "output": output})
+                for i, output in enumerate(["../escape", "/tmp/escape", "sub/graph", ".."])
+            ))
+        finally:
+            service.shutdown()
+
+    responses = asyncio.run(go())
+    assert all(r["ok"] is False for r in responses)
+    assert all("ValueError" in r["error"] for r in responses)
+    assert not (tmp_path.parent / "escape").exists()
+
+
+def test_render_path_stays_in_output_dir(tmp_path):
+    service = MatcherService(workers=1, output_dir=str(tmp_path))
+    try:
+        assert service.output_path("graph") == str(tmp_path / "graph")
+    finally:
+        service.shutdown()
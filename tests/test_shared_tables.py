@@ -0,0 +1,100 @@
+# tests/test_shared_tables.py
+
+import itertools
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+from src.shared_tables import SharedTable, SharedMatcherPool
+from src.dfa_table import dfa_to_table, minimize_table, table_accepts
+from src.derivatives import regex_to_dfa
+from src.prepocessor import insert_concatenation_operator
+from src.parser import regex_shunting_yard
+
+
+def table_for(regex):
+    postfix = regex_shunting_yard(insert_concatenation_operator(regex))
+    return minimize_table(dfa_to_table(regex_to_dfa(postfix)[0]))
+
+
+def all_strings(alphabet, max_len):
+    for n in range(max_len + 1):
+        for chars in itertools.product(alphabet, repeat=n):
+            yield "".join(chars)
+
+
+def test_publish_and_attach_round_trip():
+    table = table_for("(a|b)*abb")
+
+    with SharedTable.publish(table) as owner:
+        worker_view = SharedTable.attach(owner.name)
+        try:
+            restored = worker_view.to_table()
+            assert restored.symbols == table.symbols
+            assert restored.transitions == table.transitions
+            assert restored.accepting == table.accepting
+
+            for text in all_strings("abc", 5):
+                assert worker_view.matches(text) == table_accepts(table, text), text
+        finally:
+            worker_view.close()
+
+
+def test_attach_rejects_foreign_blocks():
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            SharedTable.attach(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_only_publisher_can_unlink():
+    with SharedTable.publish(table_for("ab")) as owner:
+        reader = SharedTable.attach(owner.name)
+        with pytest.raises(RuntimeError):
+            reader.unlink()
+        reader.close()
+
+
+def test_pool_matches_in_workers():
+    tables = {"abb": table_for("(a|b)*abb"), "ab": table_for("(ab)*")}
+    texts = ["".join(t) for t in itertools.product("ab", repeat=4)]
+
+    with SharedMatcherPool(tables, processes=2) as pool:
+        names = [shared.name for shared in pool.tables.values()]
+        assert pool.match("abb", texts) == [re.fullmatch("(a|b)*abb", t) is not None for t in texts]
+        assert pool.match("ab", texts) == [re.fullmatch("(ab)*", t) is not None for t in texts]
+
+    # The blocks are gone once the pool is closed
+    from multiprocessing import shared_memory
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+SPAWN_SCRIPT = """
+import multiprocessing
+from src.shared_tables import SharedMatcherPool
+from tests.test_shared_tables import table_for
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    with SharedMatcherPool({"ab": table_for("(ab)*")}, processes=2) as pool:
+        print(pool.match("ab", ["abab", "aba"]))
+"""
+
+
+def test_spawned_workers_close_their_tables():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", SPAWN_SCRIPT], cwd=root, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.stdout.strip() == "[True, False]"
+    assert "BufferError" not in result.stderr